@@ -5,32 +5,71 @@ Team: Danny Nguyen, David Salas, Romeo Henderson
 File Created by Danny Nguyen
 """
 
+import os
 import socket
-import threading
-import json
+import selectors
 import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
+from utils import (
+    JSON_DECODE_ERRORS, RECV_CHUNK_SIZE, Colors, InputValidator, json_dumps, json_loads,
+)
 
-# Simple color codes for client output
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[31m'
-    GREEN = '\033[32m'
-    YELLOW = '\033[33m'
-    BLUE = '\033[34m'
-    MAGENTA = '\033[35m'
-    CYAN = '\033[36m'
-    BOLD_RED = '\033[1;31m'
-    BOLD_GREEN = '\033[1;32m'
-    BOLD_YELLOW = '\033[1;33m'
-    BOLD_BLUE = '\033[1;34m'
-    BOLD_CYAN = '\033[1;36m'
-    
-    @staticmethod
-    def colorize(text: str, color: str) -> str:
-        return f"{color}{text}{Colors.RESET}"
+# Non-blocking flag for draining reads; 0 where the platform lacks it
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0)
+
+# Socket receive buffer: room for bursts of server events between drains
+SOCKET_RCVBUF_SIZE = 262144
+
+
+def find_line_ends(buffer: bytearray, start: int = 0) -> List[int]:
+    """
+    Locate every newline in buffer in a single pass
+    
+    Args:
+        buffer: Received bytes not yet split into lines
+        start: Offset to start scanning from
+        
+    Returns:
+        Offsets of each b"\n" in buffer, in order
+    """
+    ends = []
+    find = buffer.find
+    idx = find(b"\n", start)
+    while idx >= 0:
+        ends.append(idx)
+        idx = find(b"\n", idx + 1)
+    return ends
+
+
+def pop_lines(buffer: bytearray, start: int = 0) -> List[bytes]:
+    """
+    Remove and return every complete line held in buffer
+    
+    Args:
+        buffer: Received bytes; any trailing partial line is left in place
+        start: Offset to start scanning from (earlier bytes hold no newline)
+        
+    Returns:
+        Complete lines without their trailing newline
+    """
+    line_ends = find_line_ends(buffer, start)
+    if not line_ends:
+        return []
+    
+    # Copy out every complete line at once, then drop them from the
+    # buffer with a single delete
+    last = line_ends[-1]
+    complete = bytes(buffer[:last + 1])
+    del buffer[:last + 1]
+    
+    lines = []
+    begin = 0
+    for end in line_ends:
+        lines.append(complete[begin:end])
+        begin = end + 1
+    return lines
 
 
 class ChatClient:
@@ -38,6 +77,16 @@ class ChatClient:
     Simple text-based chat client for connecting to ChatServer
     """
     
+    # Pre-encoded color prefixes per message type (chat messages don't need
+    # extra coloring); display output is written to stdout as bytes
+    _RESET = Colors.RESET.encode('ascii')
+    _YELLOW_PRE = Colors.YELLOW.encode('ascii')
+    _LINE_COLORS = {
+        "error": Colors.BOLD_RED.encode('ascii'),
+        "success": Colors.BOLD_GREEN.encode('ascii'),
+        "info": Colors.CYAN.encode('ascii'),
+    }
+    
     def __init__(self):
         """
         Initialize the chat client
@@ -46,10 +95,48 @@ class ChatClient:
         self.connected = False
         self.nickname = ""
         self.current_channel = ""
-        self.receive_thread = None
         self.running = False
         self.server_host = ""
         self.server_port = 0
+        # Pre-serialized JSON prefix for send_command, rebuilt on nickname change
+        self._cmd_prefix_cache: Optional[bytes] = None
+        self._cmd_prefix_nick = ""
+        # Last formatted display timestamp, refreshed at most once per second
+        self._ts_cached_sec = -1
+        self._ts_cached_prefix = b""
+        # Display output goes to the binary stdout buffer; flushes are
+        # deferred while a burst of server events is being drained
+        sys.stdout.flush()
+        self._out = sys.stdout.buffer
+        self._defer_flush = False
+        # Socket and terminal input are multiplexed on one selector in the
+        # main thread; each keeps its own partial-line buffer
+        self._selector = selectors.DefaultSelector()
+        self._recv_buffer = bytearray()
+        self._input_buffer = bytearray()
+        # Normalized ("#"-prefixed) channel names, keyed by what the user typed
+        self._channel_norm_cache: Dict[str, str] = {}
+        # User commands: name -> (handler, argument required, usage text)
+        self._commands = {
+            "connect": (self._cmd_connect, True, "/connect <server> [port]"),
+            "nick": (self._cmd_nick, True, "/nick <nickname>"),
+            "join": (self._cmd_join, True, "/join <channel>"),
+            "leave": (self._cmd_leave, False, "/leave [channel]"),
+            "list": (self._cmd_list, False, "/list"),
+            "quit": (self._cmd_quit, False, "/quit"),
+            "help": (self._cmd_help, False, "/help"),
+        }
+        # Dispatch tables for server messages, keyed by "type" and "event"
+        self._type_handlers = {
+            "response": self._on_response,
+            "event": self._on_event,
+        }
+        self._event_handlers = {
+            "message": self._on_message,
+            "user_joined": self._on_user_joined,
+            "user_left": self._on_user_left,
+            "channel_list": self._on_channel_list,
+        }
     
     def connect_to_server(self, server_name: str, port: int = 8080) -> bool:
         """
@@ -65,11 +152,20 @@ class ChatClient:
         try:
             # Create client socket
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Disable Nagle so each small command line goes out immediately.
+            # Trades a few extra packets for much lower per-message latency.
+            self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_SIZE)
             self.client_socket.settimeout(10)  # 10 second timeout
             
             # Connect to server
-            print(f"Connecting to {server_name}:{port}...")
+            self._out.write(f"Connecting to {server_name}:{port}...\n".encode('utf-8'))
+            self._out.flush()
             self.client_socket.connect((server_name, port))
+            # The timeout only guards connect(); sendall() must not give up
+            # part-way through a line
+            self.client_socket.setblocking(True)
             
             # Connection successful
             self.connected = True
@@ -77,9 +173,9 @@ class ChatClient:
             self.server_port = port
             self.running = True
             
-            # Start message receiving thread
-            self.receive_thread = threading.Thread(target=self.receive_messages, daemon=True)
-            self.receive_thread.start()
+            # Watch for server messages from the main loop
+            self._recv_buffer.clear()
+            self._selector.register(self.client_socket, selectors.EVENT_READ, "sock")
             
             self.display_message(f"Connected to {server_name}:{port}", "success")
             self.display_message("Set your nickname with: /nick <your_nickname>", "info")
@@ -113,17 +209,12 @@ class ChatClient:
             return False
         
         try:
-            # Create simple message format (we'll use JSON-like structure)
-            message = {
-                "type": "command",
-                "command": command_str,
-                "nickname": self.nickname,
-                "timestamp": time.time()
-            }
-            
-            # Send as JSON
-            message_json = json.dumps(message) + "\n"
-            self.client_socket.send(message_json.encode('utf-8'))
+            # Same wire format as {"type", "nickname", "timestamp", "command"},
+            # but only the variable fields are serialized per call
+            payload = (self._command_prefix()
+                       + str(time.time_ns()).encode('ascii')
+                       + b',"command":' + json_dumps(command_str) + b"}\n")
+            self.client_socket.sendall(payload)
             return True
             
         except BrokenPipeError:
@@ -134,38 +225,80 @@ class ChatClient:
             self.display_message(f"Error sending command: {e}", "error")
             return False
     
+    def _command_prefix(self) -> bytes:
+        """
+        Return the cached JSON prefix shared by every outgoing command
+        
+        Returns:
+            Encoded '{"type":"command","nickname":...,"timestamp":' prefix
+        """
+        if self._cmd_prefix_cache is None or self._cmd_prefix_nick != self.nickname:
+            self._cmd_prefix_nick = self.nickname
+            self._cmd_prefix_cache = (b'{"type":"command","nickname":'
+                                      + json_dumps(self.nickname)
+                                      + b',"timestamp":')
+        return self._cmd_prefix_cache
+    
     def receive_messages(self) -> None:
         """
-        Receive messages from server (runs in separate thread)
+        Receive and process whatever the server has sent (socket is readable)
         """
-        buffer = ""
-        
-        while self.running and self.connected:
-            try:
-                # Receive data from server
-                data = self.client_socket.recv(1024).decode('utf-8')
+        # Drain everything the kernel has buffered in one wakeup. The socket
+        # stays blocking for sendall(), so follow-up reads use MSG_DONTWAIT.
+        scan_from = len(self._recv_buffer)
+        closed = False
+        flags = 0
+        try:
+            while True:
+                try:
+                    data = self.client_socket.recv(RECV_CHUNK_SIZE, flags)
+                except BlockingIOError:
+                    break
                 if not data:
-                    # Server closed connection
-                    self.display_message("Server closed connection.", "error")
-                    self.connected = False
+                    closed = True
                     break
-                
-                buffer += data
-                
-                # Process complete messages (separated by newlines)
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    if line.strip():
-                        self.process_server_message(line.strip())
-                        
-            except socket.timeout:
-                continue  # Keep trying
-            except Exception as e:
-                if self.running:  # Only show error if we're still supposed to be running
-                    self.display_message(f"Error receiving messages: {e}", "error")
-                break
+                self._recv_buffer.extend(data)
+                if not _MSG_DONTWAIT or len(data) < RECV_CHUNK_SIZE:
+                    # A short read already emptied the kernel buffer
+                    break
+                flags = _MSG_DONTWAIT
+        except OSError as e:
+            if self.running:  # Only show error if we're still supposed to be running
+                self.display_message(f"Error receiving messages: {e}", "error")
+            self._close_socket()
+            return
         
-        self.connected = False
+        # Process complete messages (separated by newlines); only whole
+        # lines are decoded, so split UTF-8 sequences are safe. Bytes left
+        # over from earlier reads hold no newline, so only the new data
+        # needs scanning.
+        lines = pop_lines(self._recv_buffer, scan_from)
+        if lines:
+            self._process_lines(lines)
+        
+        if closed:
+            # Server closed connection
+            if self.running:
+                self.display_message("Server closed connection.", "error")
+            self._close_socket()
+    
+    def _process_lines(self, lines: List[bytes]) -> None:
+        """
+        Decode and process a batch of complete lines from the server
+        
+        Args:
+            lines: Raw lines without their trailing newline
+        """
+        self._defer_flush = True
+        try:
+            for raw in lines:
+                line = raw.decode('utf-8', 'replace').strip()
+                if line:
+                    self.process_server_message(line)
+        finally:
+            # One flush per recv burst instead of one per line
+            self._defer_flush = False
+            self._out.flush()
     
     def process_server_message(self, message: str) -> None:
         """
@@ -174,93 +307,156 @@ class ChatClient:
         Args:
             message: Raw message from server
         """
+        # Server objects always start with "{"; anything else is plain text
+        # and skips the parser (and its exception) entirely
+        if not message or message[0] != "{":
+            self.display_message(message, "info")
+            return
+        
         try:
-            # Try to parse as JSON
-            data = json.loads(message)
-            
-            if data.get("type") == "response":
-                # Server response to our command
-                if data.get("success"):
-                    self.display_message(data.get("message", "Success"), "success")
-                else:
-                    self.display_message(data.get("message", "Error"), "error")
-                    
-            elif data.get("type") == "event":
-                # Server event (user joined, message broadcast, etc.)
-                event_type = data.get("event")
-                
-                if event_type == "message":
-                    # Chat message
-                    nickname = data.get("nickname", "Unknown")
-                    channel = data.get("channel", "")
-                    msg = data.get("message", "")
-                    self.display_message(f"[{channel}] <{nickname}> {msg}", "chat")
-                    
-                elif event_type == "user_joined":
-                    nickname = data.get("nickname", "Unknown")
-                    channel = data.get("channel", "")
-                    self.display_message(f"*** {nickname} joined {channel}", "info")
-                    
-                elif event_type == "user_left":
-                    nickname = data.get("nickname", "Unknown")
-                    channel = data.get("channel", "")
-                    self.display_message(f"*** {nickname} left {channel}", "info")
-                    
-                elif event_type == "channel_list":
-                    channels = data.get("channels", [])
-                    self.display_message("\n=== Channel List ===", "info")
-                    if channels:
-                        for channel in channels:
-                            name = channel.get("name", "")
-                            count = channel.get("users", 0)
-                            self.display_message(f"  {name} ({count} users)", "info")
-                    else:
-                        self.display_message("  No channels available", "info")
-                    self.display_message("==================\n", "info")
-                    
-            else:
-                # Plain text message
-                self.display_message(message, "info")
-                
-        except json.JSONDecodeError:
+            data = json_loads(message)
+        except JSON_DECODE_ERRORS:
             # Not JSON, treat as plain text
             self.display_message(message, "info")
+            return
+        
+        handler = self._type_handlers.get(data.get("type"))
+        if handler:
+            handler(data)
+        else:
+            # Plain text message
+            self.display_message(message, "info")
+    
+    def _on_response(self, data: Dict[str, Any]) -> None:
+        """Server response to our command"""
+        if data.get("success"):
+            self.display_message(data.get("message", "Success"), "success")
+        else:
+            self.display_message(data.get("message", "Error"), "error")
+    
+    def _on_event(self, data: Dict[str, Any]) -> None:
+        """Server event (user joined, message broadcast, etc.)"""
+        handler = self._event_handlers.get(data.get("event"))
+        if handler:
+            handler(data)
+    
+    def _on_message(self, data: Dict[str, Any]) -> None:
+        """Chat message event"""
+        nickname = data.get("nickname", "Unknown")
+        channel = data.get("channel", "")
+        msg = data.get("message", "")
+        self.display_message(f"[{channel}] <{nickname}> {msg}", "chat")
+    
+    def _on_user_joined(self, data: Dict[str, Any]) -> None:
+        """User joined channel event"""
+        nickname = data.get("nickname", "Unknown")
+        channel = data.get("channel", "")
+        self.display_message(f"*** {nickname} joined {channel}", "info")
+    
+    def _on_user_left(self, data: Dict[str, Any]) -> None:
+        """User left channel event"""
+        nickname = data.get("nickname", "Unknown")
+        channel = data.get("channel", "")
+        self.display_message(f"*** {nickname} left {channel}", "info")
+    
+    def _on_channel_list(self, data: Dict[str, Any]) -> None:
+        """Channel list event"""
+        channels = data.get("channels", [])
+        self.display_message("\n=== Channel List ===", "info")
+        if channels:
+            for channel in channels:
+                name = channel.get("name", "")
+                count = channel.get("users", 0)
+                self.display_message(f"  {name} ({count} users)", "info")
+        else:
+            self.display_message("  No channels available", "info")
+        self.display_message("==================\n", "info")
     
     def process_user_input(self) -> None:
         """
-        Process user input from terminal
+        Main event loop: wait on terminal input and the server socket together
+        and handle whichever is ready
         """
-        while self.running:
-            try:
-                user_input = input().strip()
-                
-                if not user_input:
-                    continue
-                
-                # Check if it's a command or regular message
-                if user_input.startswith("/"):
-                    # It's a command
-                    if not self.parse_and_handle_command(user_input):
-                        continue
-                else:
-                    # It's a regular chat message
-                    if not self.connected:
-                        self.display_message("Not connected. Use /connect to connect to a server.", "error")
-                        continue
-                    
-                    if not self.current_channel:
-                        self.display_message("Not in a channel. Use /join <channel> to join a channel.", "error")
-                        continue
-                    
-                    # Send as regular message
-                    self.send_command(user_input)
-                    
-            except EOFError:
-                # Ctrl+D pressed
-                break
-            except KeyboardInterrupt:
-                # Ctrl+C pressed
+        stdin_fd = sys.stdin.fileno()
+        try:
+            self._selector.register(stdin_fd, selectors.EVENT_READ, "stdin")
+        except PermissionError:
+            # epoll refuses regular files and /dev/null (stdin redirected
+            # from a file); select() accepts them and reports them readable
+            self._use_select_selector()
+            self._selector.register(stdin_fd, selectors.EVENT_READ, "stdin")
+        try:
+            while self.running:
+                for key, _ in self._selector.select(timeout=0.5):
+                    if key.data == "stdin":
+                        if not self._read_stdin(stdin_fd):
+                            # Ctrl+D pressed
+                            return
+                    elif self.connected:
+                        self.receive_messages()
+                    if not self.running:
+                        break
+        finally:
+            self._selector.unregister(stdin_fd)
+    
+    def _use_select_selector(self) -> None:
+        """
+        Move every registration onto a select()-based selector
+        """
+        selector = selectors.SelectSelector()
+        for key in list(self._selector.get_map().values()):
+            selector.register(key.fileobj, key.events, key.data)
+        self._selector.close()
+        self._selector = selector
+    
+    def _read_stdin(self, stdin_fd: int) -> bool:
+        """
+        Read what the terminal has buffered and handle each complete line
+        
+        Args:
+            stdin_fd: File descriptor of standard input
+            
+        Returns:
+            False once standard input reaches end of file, True otherwise
+        """
+        data = os.read(stdin_fd, 4096)
+        if not data:
+            return False
+        
+        self._input_buffer.extend(data)
+        for raw in pop_lines(self._input_buffer, len(self._input_buffer) - len(data)):
+            self.handle_user_input(raw.decode('utf-8', 'replace').strip())
+            if not self.running:
                 break
+        return True
+    
+    def handle_user_input(self, user_input: str) -> None:
+        """
+        Handle one line of user input
+        
+        Args:
+            user_input: Line typed by the user, already stripped
+        """
+        if not user_input:
+            return
+        
+        # Check if it's a command or regular message
+        if user_input.startswith("/"):
+            # It's a command
+            self.parse_and_handle_command(user_input)
+            return
+        
+        # It's a regular chat message
+        if not self.connected:
+            self.display_message("Not connected. Use /connect to connect to a server.", "error")
+            return
+        
+        if not self.current_channel:
+            self.display_message("Not in a channel. Use /join <channel> to join a channel.", "error")
+            return
+        
+        # Send as regular message
+        self.send_command(user_input)
     
     def parse_and_handle_command(self, command_str: str) -> bool:
         """
@@ -272,84 +468,114 @@ class ChatClient:
         Returns:
             True if command was handled, False otherwise
         """
-        parts = command_str[1:].split()  # Remove / and split
+        # Remove / and split off the command name at any whitespace;
+        # handlers that take arguments split the rest themselves
+        parts = command_str[1:].split(None, 1)
         if not parts:
             return False
         
         cmd = parts[0].lower()
-        args = parts[1:] if len(parts) > 1 else []
+        rest = parts[1].strip() if len(parts) > 1 else ""
         
-        if cmd == "connect":
-            if len(args) < 1:
-                self.display_message("Usage: /connect <server> [port]", "error")
-                return False
-            
-            server = args[0]
-            port = int(args[1]) if len(args) > 1 else 8080
-            
-            if self.connected:
-                self.display_message("Already connected. Use /quit to disconnect first.", "error")
-                return False
-            
-            return self.connect_to_server(server, port)
+        entry = self._commands.get(cmd)
+        if not entry:
+            self.display_message(f"Unknown command: /{cmd}. Type /help for available commands.", "error")
+            return False
         
-        elif cmd == "nick":
-            if len(args) < 1:
-                self.display_message("Usage: /nick <nickname>", "error")
-                return False
-            
-            new_nick = args[0]
-            if len(new_nick) > 32:
-                self.display_message("Nickname too long (max 32 characters)", "error")
-                return False
-            
-            self.nickname = new_nick
-            if self.connected:
-                self.send_command(command_str)
-            else:
-                self.display_message(f"Nickname set to '{new_nick}' (will be used when you connect)", "success")
-            return True
+        handler, needs_arg, usage = entry
+        if needs_arg and not rest:
+            self.display_message(f"Usage: {usage}", "error")
+            return False
         
-        elif cmd == "join":
-            if len(args) < 1:
-                self.display_message("Usage: /join <channel>", "error")
-                return False
-            
-            channel = args[0]
-            if not channel.startswith("#"):
-                channel = "#" + channel
-            
-            self.current_channel = channel
-            return self.send_command(f"/join {channel}")
+        return handler(rest)
+    
+    def _cmd_connect(self, rest: str) -> bool:
+        """Handle /connect <server> [port]"""
+        args = rest.split()
+        server = args[0]
+        port = int(args[1]) if len(args) > 1 else 8080
         
-        elif cmd == "leave":
-            channel = args[0] if args else self.current_channel
-            if channel and not channel.startswith("#"):
-                channel = "#" + channel
-            
-            if channel == self.current_channel:
-                self.current_channel = ""
-            
-            return self.send_command(f"/leave {channel}" if channel else "/leave")
+        if self.connected:
+            self.display_message("Already connected. Use /quit to disconnect first.", "error")
+            return False
         
-        elif cmd == "list":
-            return self.send_command("/list")
+        return self.connect_to_server(server, port)
+    
+    def _cmd_nick(self, rest: str) -> bool:
+        """Handle /nick <nickname>"""
+        new_nick = rest.split(None, 1)[0]
+        if not InputValidator.validate_nickname(new_nick):
+            self.display_message("Invalid nickname (1-32 letters, digits, '_' or '-')", "error")
+            return False
         
-        elif cmd == "quit":
-            if self.connected:
-                self.send_command("/quit")
-                time.sleep(0.5)  # Give server time to process
-            self.disconnect()
-            self.running = False
-            return True
+        self.nickname = new_nick
+        self._cmd_prefix_cache = None
+        if self.connected:
+            self.send_command(f"/nick {new_nick}")
+        else:
+            self.display_message(f"Nickname set to '{new_nick}' (will be used when you connect)", "success")
+        return True
+    
+    def _cmd_join(self, rest: str) -> bool:
+        """Handle /join <channel>"""
+        channel = self._norm_channel(rest.split(None, 1)[0])
         
-        elif cmd == "help":
-            self.show_help()
-            return True
+        self.current_channel = channel
+        return self.send_command(f"/join {channel}")
+    
+    def _cmd_leave(self, rest: str) -> bool:
+        """Handle /leave [channel]"""
+        channel = self._norm_channel(rest.split(None, 1)[0]) if rest else self.current_channel
         
-        else:
-            self.display_message(f"Unknown command: /{cmd}. Type /help for available commands.", "error")
-            return False
+        if channel == self.current_channel:
+            self.current_channel = ""
+        
+        return self.send_command(f"/leave {channel}" if channel else "/leave")
+    
+    def _norm_channel(self, name: str) -> str:
+        """
+        Return the channel name with a leading "#", reusing cached results
+        
+        Args:
+            name: Channel name as typed by the user
+            
+        Returns:
+            Channel name starting with "#"
+        """
+        channel = self._channel_norm_cache.get(name)
+        if channel is None:
+            channel = name if name.startswith("#") else "#" + name
+            if len(self._channel_norm_cache) >= 64:
+                # Users only touch a handful of channels; keep the cache small
+                self._channel_norm_cache.clear()
+            self._channel_norm_cache[name] = channel
+        return channel
+    
+    def _cmd_list(self, rest: str) -> bool:
+        """Handle /list"""
+        return self.send_command("/list")
+    
+    def _cmd_quit(self, rest: str) -> bool:
+        """Handle /quit"""
+        if self.connected:
+            self.send_command("/quit")
+            # Half-close instead of sleeping: pending bytes are flushed and
+            # the server sees EOF immediately. Show the server's reply until
+            # it closes its side (at most one second).
+            self.running = False
+            try:
+                self.client_socket.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self._drain_until_closed(1.0)
+        self.disconnect()
+        self.running = False
+        return True
+    
+    def _cmd_help(self, rest: str) -> bool:
+        """Handle /help"""
+        self.show_help()
+        return True
     
     def display_message(self, message: str, message_type: str = "info") -> None:
         """
@@ -359,18 +585,29 @@ class ChatClient:
             message: Message to display
             message_type: Type of message (info, error, success, chat)
         """
-        timestamp = time.strftime("%H:%M:%S")
+        now = int(time.time())
+        if now != self._ts_cached_sec:
+            self._ts_cached_sec = now
+            self._ts_cached_prefix = time.strftime("[%H:%M:%S] ", time.localtime(now)).encode('ascii')
         
-        if message_type == "error":
-            print(f"[{timestamp}] {Colors.colorize(message, Colors.BOLD_RED)}")
-        elif message_type == "success":
-            print(f"[{timestamp}] {Colors.colorize(message, Colors.BOLD_GREEN)}")
-        elif message_type == "chat":
-            print(f"[{timestamp}] {message}")  # Chat messages don't need extra coloring
-        elif message_type == "info":
-            print(f"[{timestamp}] {Colors.colorize(message, Colors.CYAN)}")
-        else:
-            print(f"[{timestamp}] {message}")
+        pre = self._LINE_COLORS.get(message_type)
+        body = self._wrap(pre, message) if pre else message.encode('utf-8')
+        self._out.write(b"".join((self._ts_cached_prefix, body, b"\n")))
+        if not self._defer_flush:
+            self._out.flush()
+    
+    def _wrap(self, pre: bytes, msg: str) -> bytes:
+        """
+        Wrap a message in a pre-encoded color code
+        
+        Args:
+            pre: Encoded ANSI color prefix
+            msg: Message text
+            
+        Returns:
+            Encoded colored message
+        """
+        return b"".join((pre, msg.encode('utf-8'), self._RESET))
     
     def show_help(self) -> None:
         """
@@ -404,26 +641,58 @@ Tips:
   - Type regular messages (without /) to chat in your current channel
   - Use Ctrl+C or /quit to exit gracefully
         """
-        print(Colors.colorize(help_text, Colors.YELLOW))
+        self._out.write(self._wrap(self._YELLOW_PRE, help_text) + b"\n")
+        self._out.flush()
     
     def disconnect(self) -> None:
         """
         Disconnect from server and clean up
         """
         self.running = False
+        self._close_socket()
+        
+        self.display_message("Disconnected from server.", "info")
+    
+    def _close_socket(self) -> None:
+        """
+        Stop watching the server socket and close it
+        """
         self.connected = False
         
         if self.client_socket:
+            try:
+                self._selector.unregister(self.client_socket)
+            except (KeyError, ValueError):
+                pass
             try:
                 self.client_socket.close()
             except:
                 pass
             self.client_socket = None
+    
+    def _drain_until_closed(self, timeout: float) -> None:
+        """
+        Process server messages until the server closes the connection
         
-        if self.receive_thread and self.receive_thread.is_alive():
-            self.receive_thread.join(timeout=1)
+        Waits on the socket alone: the shared selector also watches stdin,
+        which is always ready at EOF or with piped input and would turn this
+        wait into a busy loop
         
-        self.display_message("Disconnected from server.", "info")
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        if self.client_socket is None:
+            return
+        
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.client_socket, selectors.EVENT_READ)
+            while self.connected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if selector.select(timeout=remaining):
+                    self.receive_messages()
     
     def run(self) -> None:
         """
@@ -6,83 +6,192 @@ File Created by Danny Nguyen
 
 STAGE 1: Single-channel, single-threaded server ✓
 STAGE 2: Multi-channel support ✓
-STAGE 3: Multi-threading (max 4 threads) ✓
+STAGE 3: Concurrent clients (selectors event loop) ✓
 """
 
+import errno
 import socket
 import threading
-import json
 import time
 import signal
 import sys
-import select
-from typing import Dict, List, Set, Optional
+import selectors
+from collections import deque
+from types import FrameType
+from typing import Any, Deque, Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 
+from utils import (
+    HAS_REUSEPORT, JSON_DECODE_ERRORS, NL, RECV_CHUNK_SIZE,
+    InputValidator, Logger, NetworkUtils, json_dumps, json_loads,
+)
 
-# Simple color codes for server output
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[31m'
-    GREEN = '\033[32m'
-    YELLOW = '\033[33m'
-    BLUE = '\033[34m'
-    MAGENTA = '\033[35m'
-    CYAN = '\033[36m'
-    BOLD_RED = '\033[1;31m'
-    BOLD_GREEN = '\033[1;32m'
-    BOLD_YELLOW = '\033[1;33m'
-    BOLD_BLUE = '\033[1;34m'
-    BOLD_CYAN = '\033[1;36m'
-    
-    @staticmethod
-    def colorize(text: str, color: str) -> str:
-        return f"{color}{text}{Colors.RESET}"
+# recv_into() calls per readiness event: a readable socket is drained until
+# it would block, but no more than this, so one flooding client cannot
+# starve the rest of the loop
+READ_BURST = 16
 
+# Sent bytes at the front of an output buffer are only deleted once they
+# exceed this size and half the buffer, so partial sends rarely move data
+OUT_COMPACT_THRESHOLD = 4096
 
-@dataclass
+# Seconds without activity before an empty server shuts itself down, and
+# how often the event loop checks for it
+INACTIVITY_TIMEOUT = 180.0
+INACTIVITY_CHECK_INTERVAL = 30.0
+
+# Text of the /help response
+HELP_TEXT = """
+=== CHAT SERVER HELP ===
+
+Available Commands:
+  /nick <nickname>     - Set your nickname
+  /list                - List all channels and user counts
+  /join [<channel>]    - Join a channel (default: #general)
+  /leave [<channel>]   - Leave channel (or all channels if none specified)
+  /quit                - Disconnect from server
+  /help                - Show this help message
+
+Examples:
+  /nick alice          - Set nickname to 'alice'
+  /join #general       - Join #general channel
+  /join programming    - Join #programming channel (# added automatically)
+  /leave #general      - Leave #general channel
+  /leave               - Leave all channels
+  Hello everyone!      - Send message to current channels
+
+Tips:
+  - Set a nickname before joining channels
+  - You can be in multiple channels at once
+  - Regular messages (without /) are sent to all your channels
+        """
+
+# Constant responses are encoded once at import instead of per request
+_HELP_FRAME = json_dumps({"type": "response", "success": True, "message": HELP_TEXT})
+_GOODBYE_FRAME = json_dumps({"type": "response", "success": True, "message": "Goodbye!"})
+_SHUTDOWN_FRAME = json_dumps({
+    "type": "response",
+    "success": True,
+    "message": "Server is shutting down. Goodbye!"
+})
+
+
+@dataclass(slots=True)
 class ClientInfo:
-    """Information about connected clients"""
+    """Information about connected clients (slotted: no per-instance __dict__)"""
     socket: socket.socket
+    reactor: "ReactorInfo"  # Event loop that owns the socket
     nickname: str = ""
     channels: Set[str] = field(default_factory=set)
-    last_activity: float = field(default_factory=time.time)
-    address: tuple = ("", 0)
+    last_activity: float = field(default_factory=time.monotonic)
+    address: Tuple[str, int] = ("", 0)
+    buffer: bytearray = field(default_factory=bytearray)  # Partial line received so far
+    out_buf: bytearray = field(default_factory=bytearray)  # Queued output
+    out_head: int = 0  # Bytes of out_buf already sent
+    out_lock: threading.Lock = field(default_factory=threading.Lock)  # Guards out_buf across workers
+
+
+@dataclass
+class ChannelInfo:
+    """
+    Members of a channel, guarded by the channel's own lock. Writers also
+    publish an immutable tuple of the members, so broadcasts read the
+    current membership without taking the lock.
+    """
+    members: Set[socket.socket] = field(default_factory=set)
+    snapshot: Tuple[socket.socket, ...] = ()
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    
+    def add(self, member: socket.socket) -> None:
+        """Add a member and republish the snapshot"""
+        with self.lock:
+            if member not in self.members:
+                self.members.add(member)
+                self.snapshot = tuple(self.members)
     
-    def __post_init__(self):
-        if not self.last_activity:
-            self.last_activity = time.time()
+    def discard(self, member: socket.socket) -> bool:
+        """Remove a member if present; returns True if the channel is now empty"""
+        with self.lock:
+            if member in self.members:
+                self.members.discard(member)
+                self.snapshot = tuple(self.members)
+            return not self.members
+
+
+@dataclass
+class ReactorInfo:
+    """One event loop: its selector, listening socket and wakeup socket pair"""
+    sel: selectors.BaseSelector
+    listener: socket.socket
+    # (read end, write end); a socket pair rather than os.pipe() because
+    # select() on Windows only accepts sockets
+    wake: Tuple[socket.socket, socket.socket]
+    # Clients queued by other workers: flushed if still connected,
+    # otherwise released (unregistered and closed)
+    pending: Deque[ClientInfo] = field(default_factory=deque)
+    # Clients with newly queued output, flushed once per loop iteration
+    dirty: List[ClientInfo] = field(default_factory=list)
+    # Scratch receive buffer; only this loop's thread reads into it
+    recv_view: memoryview = field(default_factory=lambda: memoryview(bytearray(RECV_CHUNK_SIZE)))
+    thread: Optional[threading.Thread] = None
+    thread_ident: Optional[int] = None  # Thread allowed to touch sel
 
 
 class ChatServer:
     """
     Multi-client chat server supporting IRC-style commands
-    Supports all 3 stages: single-channel → multi-channel → multi-threaded
+    Supports all 3 stages: single-channel → multi-channel → concurrent clients,
+    served from selectors (epoll on Linux) event loops, one per worker
     """
     
-    def __init__(self, port: int = 8080, debug_level: int = 0):
+    # Selector key data marking a reactor's wakeup socket
+    _WAKE = "wake"
+    
+    def __init__(self, port: int = 8080, debug_level: int = 0, worker_count: int = 1) -> None:
         """
         Initialize the chat server
         
         Args:
             port: Port number to bind to
             debug_level: 0 for errors only, 1 for all events
+            worker_count: Event loop threads, each with its own SO_REUSEPORT
+                listening socket (1 keeps the server single-threaded)
         """
         self.port = port
-        self.debug_level = debug_level
-        self.server_socket = None
+        # Timestamped, colored log lines; disabled levels are no-op calls
+        self.logger = Logger(debug_level)
+        self.worker_count = max(1, worker_count)
+        self.server_socket: Optional[socket.socket] = None
         self.clients: Dict[socket.socket, ClientInfo] = {}
-        self.channels: Dict[str, Set[socket.socket]] = {}
+        self.channels: Dict[str, ChannelInfo] = {}
+        # Nickname -> owning socket, for O(1) uniqueness checks
+        self._nicks: Dict[str, socket.socket] = {}
         self.running = False
-        self.lock = threading.Lock()  # For thread safety in Stage 3
-        self.max_threads = 4  # Stage 3 requirement
-        self.active_threads = 0
-        self.last_activity = time.time()
-        self.inactivity_timer = None
+        # Guards the clients/channels dict structure against the workers;
+        # each channel's membership has its own lock (always taken after
+        # this one). Never held while sending or
+        # broadcasting.
+        self._clients_lock = threading.Lock()
+        # Event loops, created by start_server(); each owns a subset of the
+        # clients and is the only thread that touches its selector
+        self.reactors: List[ReactorInfo] = []
+        self.last_activity = time.monotonic()
+        # When the main event loop next checks for inactivity (monotonic)
+        self._next_inactivity_check = 0.0
+        
+        # Slash-command dispatch; every handler takes (client_socket, args)
+        self._commands = {
+            "nick": self.handle_nick_command,
+            "list": self.handle_list_command,
+            "join": self.handle_join_command,
+            "leave": self.handle_leave_command,
+            "quit": self.handle_quit_command,
+            "help": self.handle_help_command,
+        }
         
         # Default channel for Stage 1
         self.default_channel = "#general"
-        self.channels[self.default_channel] = set()
+        self.channels[self.default_channel] = ChannelInfo()
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -96,44 +205,63 @@ class ChatServer:
             message: Message to log
             level: Log level (info, error, success, debug)
         """
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        
-        if level == "error" or self.debug_level >= 1:
-            if level == "error":
-                print(f"[{timestamp}] {Colors.colorize(f'ERROR: {message}', Colors.BOLD_RED)}")
-            elif level == "success":
-                print(f"[{timestamp}] {Colors.colorize(message, Colors.BOLD_GREEN)}")
-            elif level == "debug" and self.debug_level >= 1:
-                print(f"[{timestamp}] {Colors.colorize(f'DEBUG: {message}', Colors.CYAN)}")
-            else:
-                print(f"[{timestamp}] {Colors.colorize(message, Colors.YELLOW)}")
+        getattr(self.logger, level, self.logger.info)(message)
+    
+    @property
+    def debug_level(self) -> int:
+        """0 for errors only, 1 for all events"""
+        return self.logger.debug_level
+    
+    @debug_level.setter
+    def debug_level(self, level: int) -> None:
+        self.logger.debug_level = level
     
     def start_server(self) -> None:
         """
         Start the chat server
         """
         try:
-            # Create and configure server socket
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Several workers need SO_REUSEPORT so the kernel can spread
+            # incoming connections across one listening socket per worker
+            reuse_port = self.worker_count > 1
+            if reuse_port and not HAS_REUSEPORT:
+                self.log("SO_REUSEPORT is not available; running a single worker", "info")
+                self.worker_count = 1
+                reuse_port = False
             
-            # Bind to port and start listening
-            self.server_socket.bind(('', self.port))
-            self.server_socket.listen(5)
+            if reuse_port:
+                # The first bind is a plain one: SO_REUSEPORT alone would let
+                # this server join another instance's group on the same port
+                # and take half of its clients instead of failing
+                NetworkUtils.create_server_socket(self.port).close()
+            
+            for _ in range(self.worker_count):
+                self.reactors.append(self._create_reactor(self._create_listener(reuse_port)))
+            self.server_socket = self.reactors[0].listener
             
             self.running = True
             self.log(f"Chat server started on port {self.port}", "success")
             self.log(f"Debug level: {self.debug_level} ({'All Events' if self.debug_level == 1 else 'Errors Only'})", "info")
+            if self.worker_count > 1:
+                self.log(f"Workers: {self.worker_count}", "info")
             self.log("Waiting for client connections...", "info")
             
-            # Start inactivity timer
-            self.reset_inactivity_timer()
+            # Start the inactivity countdown
+            self.last_activity = time.monotonic()
+            self._next_inactivity_check = self.last_activity + INACTIVITY_CHECK_INTERVAL
+            
+            # Extra workers get their own threads; the first one runs here so
+            # signal handling and the final cleanup stay on the main thread
+            for reactor in self.reactors[1:]:
+                reactor.thread = threading.Thread(target=self.run_event_loop, args=(reactor,), daemon=True)
+                reactor.thread.start()
             
-            # Start accepting client connections
-            self.accept_clients()
+            # Serve clients until shutdown is requested, then clean up
+            self.run_event_loop(self.reactors[0])
+            self.graceful_shutdown()
             
         except OSError as e:
-            if e.errno == 48:  # Address already in use
+            if e.errno == errno.EADDRINUSE:
                 self.log(f"Port {self.port} is already in use. Try a different port.", "error")
             else:
                 self.log(f"Failed to start server: {e}", "error")
@@ -142,113 +270,318 @@ class ChatServer:
             self.log(f"Server startup error: {e}", "error")
             sys.exit(1)
     
-    def accept_clients(self) -> None:
+    def _create_reactor(self, listener: socket.socket) -> ReactorInfo:
+        """
+        Create an event loop's selector and its non-blocking wakeup socket pair
+        
+        Args:
+            listener: Listening socket the event loop accepts from
+        """
+        # epoll keeps the registered set in the kernel so each wait costs
+        # O(ready), not O(sockets)
+        sel = getattr(selectors, "EpollSelector", selectors.DefaultSelector)()
+        wake = socket.socketpair()
+        for sock in wake:
+            sock.setblocking(False)
+        sel.register(listener, selectors.EVENT_READ, data=None)
+        sel.register(wake[0], selectors.EVENT_READ, data=self._WAKE)
+        return ReactorInfo(sel=sel, listener=listener, wake=wake)
+    
+    def _create_listener(self, reuse_port: bool) -> socket.socket:
+        """
+        Create a non-blocking listening socket bound to the server port
+        
+        Args:
+            reuse_port: Set SO_REUSEPORT so several workers can bind the port
+        """
+        sock = NetworkUtils.create_server_socket(self.port, reuse_port)
+        sock.setblocking(False)
+        return sock
+    
+    def run_event_loop(self, reactor: Optional[ReactorInfo] = None) -> None:
         """
-        Accept incoming client connections
+        Wait for ready sockets and dispatch them: the listening socket
+        accepts new clients, client sockets are read and flushed. Blocks
+        in the kernel until something is ready or the next inactivity
+        check is due; the wakeup socket interrupts it for shutdown or for work
+        queued by other workers.
+        
+        Args:
+            reactor: Event loop to run (default: the first worker)
         """
+        if reactor is None:
+            reactor = self.reactors[0]
+        reactor.thread_ident = threading.get_ident()
+        # The first worker also runs the periodic inactivity check, waking
+        # for it through the select() timeout instead of a timer thread
+        checks_inactivity = reactor is self.reactors[0]
+        
         while self.running:
+            timeout = None
+            if checks_inactivity:
+                timeout = max(0.0, self._next_inactivity_check - time.monotonic())
             try:
-                # Use select to check for incoming connections with timeout
-                ready, _, _ = select.select([self.server_socket], [], [], 1.0)
-                
-                if ready:
-                    client_socket, address = self.server_socket.accept()
-                    self.log(f"New connection from {address[0]}:{address[1]}", "debug")
-                    
-                    # Create client info
-                    client_info = ClientInfo(
-                        socket=client_socket,
-                        address=address
-                    )
-                    
-                    with self.lock:
-                        self.clients[client_socket] = client_info
-                        self.last_activity = time.time()
-                        self.reset_inactivity_timer()
-                    
-                    # Handle client in separate thread (Stage 3) or same thread (Stages 1-2)
-                    if self.active_threads < self.max_threads:
-                        # Stage 3: Multi-threaded
-                        client_thread = threading.Thread(
-                            target=self.handle_client_thread,
-                            args=(client_socket,),
-                            daemon=True
-                        )
-                        client_thread.start()
-                        with self.lock:
-                            self.active_threads += 1
-                    else:
-                        # Stages 1-2: Single-threaded or thread limit reached
-                        self.handle_client(client_socket)
-                        
+                events = reactor.sel.select(timeout)
             except OSError:
                 if self.running:
-                    self.log("Error accepting connections", "error")
+                    self.log("Error waiting for socket events", "error")
                 break
-            except Exception as e:
-                if self.running:
-                    self.log(f"Error in accept_clients: {e}", "error")
+            
+            if checks_inactivity:
+                now = time.monotonic()
+                if now >= self._next_inactivity_check:
+                    self._next_inactivity_check = now + INACTIVITY_CHECK_INTERVAL
+                    self.check_inactivity()
+            
+            for key, mask in events:
+                try:
+                    if key.data is None:
+                        self._accept(reactor)
+                        continue
+                    if key.data is self._WAKE:
+                        if not self.running:
+                            return
+                        self._drain_pending(reactor)
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(key)
+                    if mask & selectors.EVENT_WRITE:
+                        self._write(key)
+                except Exception as e:
+                    if self.running:
+                        self.log(f"Error in event loop: {e}", "error")
+            
+            if reactor.dirty:
+                try:
+                    self._flush_dirty(reactor)
+                except Exception as e:
+                    if self.running:
+                        self.log(f"Error in event loop: {e}", "error")
     
-    def handle_client_thread(self, client_socket: socket.socket) -> None:
+    def _accept(self, reactor: ReactorInfo) -> None:
         """
-        Handle client in separate thread (Stage 3)
+        Accept a pending client connection and start watching it
         
         Args:
-            client_socket: Socket for client communication
+            reactor: Event loop whose listening socket is readable
         """
         try:
-            self.handle_client(client_socket)
-        finally:
-            with self.lock:
-                self.active_threads -= 1
+            client_socket, address = reactor.listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            if self.running:
+                self.log(f"Error accepting connection: {e}", "error")
+            return
+        
+        self.log(f"New connection from {address[0]}:{address[1]}", "debug")
+        client_socket.setblocking(False)
+        # Frames already leave in batches: everything queued for a client
+        # goes out in one send() when the socket turns writable, so Nagle's
+        # delay would only add latency
+        try:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        
+        # Create client info
+        client_info = ClientInfo(
+            socket=client_socket,
+            reactor=reactor,
+            address=address
+        )
+        
+        with self._clients_lock:
+            self.clients[client_socket] = client_info
+        self.last_activity = time.monotonic()
+        
+        reactor.sel.register(client_socket, selectors.EVENT_READ, data=client_info)
     
-    def handle_client(self, client_socket: socket.socket) -> None:
+    def _drain_pending(self, reactor: ReactorInfo) -> None:
         """
-        Handle communication with a single client
+        Empty a reactor's wakeup socket and apply the work other workers
+        queued for it
         
         Args:
-            client_socket: Socket for client communication
+            reactor: Event loop running on the current thread
         """
-        buffer = ""
+        try:
+            while reactor.wake[0].recv(4096):
+                pass
+        except OSError:
+            pass  # Drained
         
+        pending = reactor.pending
+        while pending:
+            client_info = pending.popleft()
+            if client_info.socket in self.clients:
+                reactor.dirty.append(client_info)
+            else:
+                self._release_socket(client_info)
+    
+    def _wake(self, reactor: ReactorInfo) -> None:
+        """Interrupt a reactor's select(); safe from any thread or signal handler"""
         try:
-            while self.running:
-                # Set socket timeout for non-blocking behavior
-                client_socket.settimeout(1.0)
-                
-                try:
-                    # Receive data from client
-                    data = client_socket.recv(1024).decode('utf-8')
-                    if not data:
-                        # Client disconnected
-                        break
-                    
-                    buffer += data
-                    
-                    # Process complete messages (separated by newlines)
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        if line.strip():
-                            self.process_client_message(client_socket, line.strip())
-                            
-                            # Update activity
-                            with self.lock:
-                                if client_socket in self.clients:
-                                    self.clients[client_socket].last_activity = time.time()
-                                self.last_activity = time.time()
-                                self.reset_inactivity_timer()
-                
-                except socket.timeout:
-                    continue  # Keep trying
-                except Exception as e:
-                    self.log(f"Error receiving from client: {e}", "error")
+            reactor.wake[1].send(b"\0")
+        except OSError:
+            pass  # Buffer full (a wakeup is already pending) or closed
+    
+    def _read(self, key: selectors.SelectorKey) -> None:
+        """
+        Drain a readable client socket and process complete lines
+        
+        Reads until the socket would block (a short read means it is empty)
+        or READ_BURST reads, so one wakeup consumes everything that arrived
+        instead of returning to select() once per chunk
+        
+        Args:
+            key: Selector key whose data is the client's ClientInfo
+        """
+        client_info = key.data
+        client_socket = client_info.socket
+        if client_socket not in self.clients:
+            # Disconnected earlier in this batch of events
+            return
+        
+        buf = client_info.buffer
+        view = client_info.reactor.recv_view
+        closed = False
+        for _ in range(READ_BURST):
+            try:
+                n = client_socket.recv_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self.log(f"Error receiving from client: {e}", "error")
+                self.disconnect_client(client_socket)
+                return
+            
+            if not n:
+                # Client disconnected; still handle the lines read before it
+                closed = True
+                break
+            buf += view[:n]
+            if n < RECV_CHUNK_SIZE:
+                # Short read: the kernel buffer is empty
+                break
+        
+        # Process complete messages (separated by newlines); only whole lines
+        # are decoded, so a multi-byte character split across reads is safe
+        start = 0
+        try:
+            while True:
+                end = buf.find(NL, start)
+                if end < 0:
                     break
+                line = buf[start:end].decode('utf-8', 'replace')
+                start = end + 1
+                if line.strip():
+                    self.process_client_message(client_socket, line.strip())
                     
+                    # Update activity; plain stores, read by the periodic check
+                    client_info.last_activity = time.monotonic()
+                    self.last_activity = time.monotonic()
+                
+                if client_socket not in self.clients:
+                    # Client quit while processing
+                    return
         except Exception as e:
             self.log(f"Error handling client: {e}", "error")
+            self.disconnect_client(client_socket)
+            return
         finally:
+            # Drop the consumed lines (including one that failed), keeping
+            # any partial one, so no line is ever handled twice
+            if start:
+                del buf[:start]
+        
+        if closed:
             self.disconnect_client(client_socket)
     
+    def _write(self, key: selectors.SelectorKey) -> None:
+        """
+        Flush as much queued output as a writable client socket accepts
+        
+        Args:
+            key: Selector key whose data is the client's ClientInfo
+        """
+        client_info = key.data
+        if client_info.socket not in self.clients:
+            return
+        
+        if self._flush(client_info):
+            # Drained; stop waiting for writability. A frame queued by
+            # another worker meanwhile comes back through the wakeup socket.
+            self._set_events(client_info, selectors.EVENT_READ)
+    
+    def _flush_dirty(self, reactor: ReactorInfo) -> None:
+        """
+        Send the output queued during this loop iteration: one send() per
+        client, with EVENT_WRITE armed only for sockets that could not take
+        it all
+        
+        Args:
+            reactor: Event loop running on the current thread
+        """
+        dirty = reactor.dirty
+        reactor.dirty = []
+        for client_info in dirty:
+            if client_info.socket in self.clients and not self._flush(client_info):
+                self._set_events(client_info, selectors.EVENT_READ | selectors.EVENT_WRITE)
+    
+    def _flush(self, client_info: ClientInfo) -> bool:
+        """
+        Send as much queued output as the client's socket accepts
+        
+        Args:
+            client_info: Connected client owned by the current thread
+        
+        Returns:
+            True if nothing is left to send (including after a failed send,
+            which disconnects the client)
+        """
+        client_socket = client_info.socket
+        with client_info.out_lock:
+            out_buf = client_info.out_buf
+            try:
+                # Send straight from the buffer; the view is released before
+                # anything can append to it
+                with memoryview(out_buf)[client_info.out_head:] as view:
+                    sent = client_socket.send(view)
+            except (BlockingIOError, InterruptedError):
+                return False
+            except OSError:
+                sent = None
+            if sent is not None:
+                head = client_info.out_head + sent
+                if head == len(out_buf):
+                    out_buf.clear()
+                    head = 0
+                elif head > OUT_COMPACT_THRESHOLD and head * 2 > len(out_buf):
+                    del out_buf[:head]
+                    head = 0
+                client_info.out_head = head
+            drained = not out_buf
+        
+        if sent is None:
+            self.disconnect_client(client_socket)
+            return True
+        return drained
+    
+    def _set_events(self, client_info: ClientInfo, events: int) -> None:
+        """
+        Change which readiness events the selector reports for a client;
+        only called on the thread that owns the client's reactor
+        
+        Args:
+            client_info: Registered client
+            events: Mask of selectors.EVENT_READ / EVENT_WRITE
+        """
+        try:
+            client_info.reactor.sel.modify(client_info.socket, events, data=client_info)
+        except (KeyError, ValueError, OSError):
+            pass  # Already unregistered or selector closed
+    
     def process_client_message(self, client_socket: socket.socket, message: str) -> None:
         """
         Process a message from a client
@@ -259,22 +592,34 @@ class ChatServer:
         """
         try:
             # Try to parse as JSON
-            data = json.loads(message)
-            
-            if data.get("type") == "command":
-                command = data.get("command", "")
-                nickname = data.get("nickname", "")
-                
-                # Update client nickname if provided
-                with self.lock:
-                    if client_socket in self.clients and nickname:
-                        self.clients[client_socket].nickname = nickname
-                
-                self.process_command(client_socket, command)
-                
-        except json.JSONDecodeError:
-            # Not JSON, treat as plain text command
+            data = json_loads(message)
+        except JSON_DECODE_ERRORS:
+            data = None
+        
+        # Plain text, and JSON values that are not objects (42, null, true),
+        # are handled as a plain text line; objects of other types are ignored
+        if not isinstance(data, dict):
             self.process_command(client_socket, message)
+            return
+        
+        if data.get("type") == "command":
+            command = data.get("command")
+            if not isinstance(command, str):
+                self.send_error(client_socket, "Malformed command message")
+                return
+            nickname = data.get("nickname", "")
+            
+            # Update client nickname if provided and not taken by another
+            # client; the index is the only record of who owns a name
+            if isinstance(nickname, str) and InputValidator.validate_nickname(nickname):
+                with self._clients_lock:
+                    client_info = self.clients.get(client_socket)
+                    owner = self._nicks.get(nickname)
+                    if (client_info is not None and client_info.nickname != nickname
+                            and (owner is None or owner is client_socket)):
+                        self._set_nickname(client_info, nickname)
+            
+            self.process_command(client_socket, command)
     
     def process_command(self, client_socket: socket.socket, command: str) -> None:
         """
@@ -284,7 +629,7 @@ class ChatServer:
             client_socket: Socket of the client who sent the command
             command: Command string to process
         """
-        with self.lock:
+        with self._clients_lock:
             if client_socket not in self.clients:
                 return
             
@@ -301,18 +646,9 @@ class ChatServer:
             
             self.log(f"Processing command: {cmd} from {client_info.nickname or 'unknown'}", "debug")
             
-            if cmd == "nick":
-                self.handle_nick_command(client_socket, args)
-            elif cmd == "list":
-                self.handle_list_command(client_socket)
-            elif cmd == "join":
-                self.handle_join_command(client_socket, args)
-            elif cmd == "leave":
-                self.handle_leave_command(client_socket, args)
-            elif cmd == "quit":
-                self.handle_quit_command(client_socket)
-            elif cmd == "help":
-                self.handle_help_command(client_socket)
+            handler = self._commands.get(cmd)
+            if handler:
+                handler(client_socket, args)
             else:
                 self.send_error(client_socket, f"Unknown command: /{cmd}")
         else:
@@ -326,27 +662,33 @@ class ChatServer:
             return
         
         new_nick = args[0]
-        if len(new_nick) > 32:
-            self.send_error(client_socket, "Nickname too long (max 32 characters)")
+        if not InputValidator.validate_nickname(new_nick):
+            self.send_error(client_socket, "Invalid nickname (1-32 letters, digits, '_' or '-')")
             return
         
-        # Check if nickname is already in use
-        with self.lock:
-            for other_socket, other_client in self.clients.items():
-                if other_socket != client_socket and other_client.nickname == new_nick:
-                    self.send_error(client_socket, f"Nickname '{new_nick}' is already in use")
-                    return
+        # Check if nickname is already in use; replies and broadcasts happen
+        # after the lock is released
+        with self._clients_lock:
+            owner = self._nicks.get(new_nick)
+            in_use = owner is not None and owner is not client_socket
             
-            # Set nickname
-            old_nick = self.clients[client_socket].nickname
-            self.clients[client_socket].nickname = new_nick
+            if not in_use:
+                # Set nickname
+                client_info = self.clients[client_socket]
+                old_nick = client_info.nickname
+                self._set_nickname(client_info, new_nick)
+                channels = tuple(client_info.channels)
+        
+        if in_use:
+            self.send_error(client_socket, f"Nickname '{new_nick}' is already in use")
+            return
         
         self.send_success(client_socket, f"Nickname set to '{new_nick}'")
-        self.log(f"Client {client_socket.getpeername()} set nickname to '{new_nick}'", "debug")
+        self.log(f"Client {client_info.address} set nickname to '{new_nick}'", "debug")
         
         # If client was in channels, notify others of nickname change
         if old_nick:
-            for channel in self.clients[client_socket].channels:
+            for channel in channels:
                 self.broadcast_to_channel(
                     {
                         "type": "event",
@@ -359,14 +701,29 @@ class ChatServer:
                     exclude=client_socket
                 )
     
-    def handle_list_command(self, client_socket: socket.socket) -> None:
+    def _set_nickname(self, client_info: ClientInfo, nickname: str) -> None:
+        """
+        Rename a client and keep the nickname index in step; caller holds
+        the clients lock and has checked that the nickname is free
+        
+        Args:
+            client_info: Client being renamed
+            nickname: New nickname
+        """
+        old_nick = client_info.nickname
+        if old_nick and self._nicks.get(old_nick) is client_info.socket:
+            del self._nicks[old_nick]
+        client_info.nickname = nickname
+        self._nicks[nickname] = client_info.socket
+    
+    def handle_list_command(self, client_socket: socket.socket, args: Optional[List[str]] = None) -> None:
         """Handle /list command"""
-        with self.lock:
+        with self._clients_lock:
             channel_list = []
-            for channel_name, users in self.channels.items():
+            for channel_name, channel_info in self.channels.items():
                 channel_list.append({
                     "name": channel_name,
-                    "users": len(users)
+                    "users": len(channel_info.snapshot)
                 })
         
         self.send_response(client_socket, {
@@ -384,21 +741,27 @@ class ChatServer:
             channel = args[0]
             if not channel.startswith("#"):
                 channel = "#" + channel
+            if not InputValidator.validate_channel_name(channel):
+                self.send_error(client_socket, "Invalid channel name (1-31 letters, digits, '_' or '-' after '#')")
+                return
         
-        with self.lock:
+        with self._clients_lock:
             client_info = self.clients[client_socket]
             
             # Check if already in channel
-            if channel in client_info.channels:
-                self.send_error(client_socket, f"You are already in {channel}")
-                return
-            
-            # Add to channel
-            if channel not in self.channels:
-                self.channels[channel] = set()
-            
-            self.channels[channel].add(client_socket)
-            client_info.channels.add(channel)
+            already_joined = channel in client_info.channels
+            if not already_joined:
+                # Add to channel
+                channel_info = self.channels.get(channel)
+                if channel_info is None:
+                    channel_info = self.channels[channel] = ChannelInfo()
+                
+                channel_info.add(client_socket)
+                client_info.channels.add(channel)
+        
+        if already_joined:
+            self.send_error(client_socket, f"You are already in {channel}")
+            return
         
         self.send_success(client_socket, f"Joined channel {channel}")
         
@@ -418,98 +781,75 @@ class ChatServer:
     
     def handle_leave_command(self, client_socket: socket.socket, args: List[str]) -> None:
         """Handle /leave command"""
-        with self.lock:
+        if args:
+            channel = args[0]
+            if not channel.startswith("#"):
+                channel = "#" + channel
+        else:
+            channel = None
+        
+        with self._clients_lock:
             client_info = self.clients[client_socket]
-            
-            if args:
-                channel = args[0]
-                if not channel.startswith("#"):
-                    channel = "#" + channel
-            else:
+            if channel is None:
                 # Leave all channels
                 channels_to_leave = list(client_info.channels)
-                for ch in channels_to_leave:
-                    self.remove_user_from_channel(client_socket, ch)
-                return
-            
-            if channel not in client_info.channels:
-                self.send_error(client_socket, f"You are not in {channel}")
-                return
-            
-            self.remove_user_from_channel(client_socket, channel)
+            elif channel in client_info.channels:
+                channels_to_leave = [channel]
+            else:
+                channels_to_leave = None
+        
+        if channels_to_leave is None:
+            self.send_error(client_socket, f"You are not in {channel}")
+            return
+        
+        for ch in channels_to_leave:
+            self.remove_user_from_channel(client_socket, ch)
     
-    def handle_quit_command(self, client_socket: socket.socket) -> None:
+    def handle_quit_command(self, client_socket: socket.socket, args: Optional[List[str]] = None) -> None:
         """Handle /quit command"""
-        self.send_success(client_socket, "Goodbye!")
+        self._send_frame(client_socket, _GOODBYE_FRAME)
         self.disconnect_client(client_socket)
     
-    def handle_help_command(self, client_socket: socket.socket) -> None:
+    def handle_help_command(self, client_socket: socket.socket, args: Optional[List[str]] = None) -> None:
         """Handle /help command"""
-        help_text = """
-=== CHAT SERVER HELP ===
-
-Available Commands:
-  /nick <nickname>     - Set your nickname
-  /list                - List all channels and user counts
-  /join [<channel>]    - Join a channel (default: #general)
-  /leave [<channel>]   - Leave channel (or all channels if none specified)
-  /quit                - Disconnect from server
-  /help                - Show this help message
-
-Examples:
-  /nick alice          - Set nickname to 'alice'
-  /join #general       - Join #general channel
-  /join programming    - Join #programming channel (# added automatically)
-  /leave #general      - Leave #general channel
-  /leave               - Leave all channels
-  Hello everyone!      - Send message to current channels
-
-Tips:
-  - Set a nickname before joining channels
-  - You can be in multiple channels at once
-  - Regular messages (without /) are sent to all your channels
-        """
-        
-        self.send_response(client_socket, {
-            "type": "response",
-            "success": True,
-            "message": help_text
-        })
+        self._send_frame(client_socket, _HELP_FRAME)
     
     def handle_chat_message(self, client_socket: socket.socket, message: str) -> None:
         """Handle regular chat message"""
-        with self.lock:
-            if client_socket not in self.clients:
+        with self._clients_lock:
+            client_info = self.clients.get(client_socket)
+            if client_info is None:
                 return
             
-            client_info = self.clients[client_socket]
-            
-            if not client_info.nickname:
-                self.send_error(client_socket, "Please set a nickname first with /nick <nickname>")
-                return
-            
-            if not client_info.channels:
-                self.send_error(client_socket, "Please join a channel first with /join <channel>")
-                return
-            
-            # Broadcast message to all channels the user is in
-            for channel in client_info.channels:
-                self.broadcast_to_channel(
-                    {
-                        "type": "event",
-                        "event": "message",
-                        "nickname": client_info.nickname,
-                        "channel": channel,
-                        "message": message,
-                        "timestamp": time.time()
-                    },
-                    channel,
-                    exclude=client_socket
-                )
+            nickname = client_info.nickname
+            channels = tuple(client_info.channels)
         
-        self.log(f"Message from {client_info.nickname}: {message}", "debug")
+        if not nickname:
+            self.send_error(client_socket, "Please set a nickname first with /nick <nickname>")
+            return
+        
+        if not channels:
+            self.send_error(client_socket, "Please join a channel first with /join <channel>")
+            return
+        
+        # Broadcast message to all channels the user is in
+        for channel in channels:
+            self.broadcast_to_channel(
+                {
+                    "type": "event",
+                    "event": "message",
+                    "nickname": nickname,
+                    "channel": channel,
+                    "message": message,
+                    "timestamp": time.time()
+                },
+                channel,
+                exclude=client_socket
+            )
+        
+        self.log(f"Message from {nickname}: {message}", "debug")
     
-    def broadcast_to_channel(self, message: dict, channel: str, exclude: socket.socket = None) -> None:
+    def broadcast_to_channel(self, message: Dict[str, Any], channel: str, exclude: Optional[socket.socket] = None) -> None:
         """
         Broadcast message to all users in a channel
         
@@ -518,26 +858,23 @@ Tips:
             channel: Channel name
             exclude: Socket to exclude from broadcast
         """
-        with self.lock:
-            if channel not in self.channels:
-                return
-            
-            message_json = json.dumps(message) + "\n"
-            disconnected_clients = []
-            
-            for client_socket in self.channels[channel]:
-                if client_socket == exclude:
-                    continue
-                
-                try:
-                    client_socket.send(message_json.encode('utf-8'))
-                except:
-                    # Client disconnected, mark for removal
-                    disconnected_clients.append(client_socket)
+        # Lock-free read path: a single dict lookup and the channel's
+        # published member tuple, which joins and leaves replace wholesale
+        channel_info = self.channels.get(channel)
+        if channel_info is None:
+            return
+        recipients = channel_info.snapshot
+        
+        # Serialize and encode once for every recipient (compact separators
+        # also keep whitespace off the wire)
+        body = json_dumps(message)
+        
+        for client_socket in recipients:
+            if client_socket == exclude:
+                continue
             
-            # Remove disconnected clients
-            for client_socket in disconnected_clients:
-                self.disconnect_client(client_socket)
+            # Queued; the event loop flushes it when the socket is writable
+            self._send_frame(client_socket, body)
     
     def remove_user_from_channel(self, client_socket: socket.socket, channel: str) -> None:
         """
@@ -547,21 +884,13 @@ Tips:
             client_socket: Client socket
             channel: Channel name
         """
-        with self.lock:
-            if client_socket not in self.clients:
+        with self._clients_lock:
+            client_info = self.clients.get(client_socket)
+            if client_info is None:
                 return
             
-            client_info = self.clients[client_socket]
-            
-            if channel in client_info.channels:
-                client_info.channels.remove(channel)
-            
-            if channel in self.channels and client_socket in self.channels[channel]:
-                self.channels[channel].remove(client_socket)
-                
-                # Delete empty channels (except default)
-                if len(self.channels[channel]) == 0 and channel != self.default_channel:
-                    del self.channels[channel]
+            nickname = client_info.nickname or "Unknown"
+            self._detach_from_channel(client_info, channel)
         
         self.send_success(client_socket, f"Left channel {channel}")
         
@@ -570,13 +899,31 @@ Tips:
             {
                 "type": "event",
                 "event": "user_left",
-                "nickname": client_info.nickname or "Unknown",
+                "nickname": nickname,
                 "channel": channel
             },
             channel
         )
         
-        self.log(f"{client_info.nickname or 'Unknown'} left {channel}", "debug")
+        self.log(f"{nickname} left {channel}", "debug")
+    
+    def _detach_from_channel(self, client_info: ClientInfo, channel: str) -> None:
+        """
+        Drop a client from a channel's membership (caller holds _clients_lock)
+        
+        Args:
+            client_info: Client leaving the channel
+            channel: Channel name
+        """
+        client_info.channels.discard(channel)
+        
+        channel_info = self.channels.get(channel)
+        if channel_info is not None:
+            empty = channel_info.discard(client_info.socket)
+            
+            # Delete empty channels (except default)
+            if empty and channel != self.default_channel:
+                del self.channels[channel]
     
     def disconnect_client(self, client_socket: socket.socket) -> None:
         """
@@ -585,35 +932,117 @@ Tips:
         Args:
             client_socket: Client socket to disconnect
         """
-        with self.lock:
-            if client_socket not in self.clients:
+        # Claim the client under the lock so a second disconnect (e.g. from
+        # a failed send) returns early; notify and close after releasing it
+        with self._clients_lock:
+            client_info = self.clients.pop(client_socket, None)
+            if client_info is None:
                 return
             
-            client_info = self.clients[client_socket]
+            # Release the nickname
+            if self._nicks.get(client_info.nickname) is client_socket:
+                del self._nicks[client_info.nickname]
             
             # Remove from all channels
-            for channel in list(client_info.channels):
-                self.remove_user_from_channel(client_socket, channel)
-            
-            # Close socket
-            try:
-                client_socket.close()
-            except:
-                pass
-            
-            # Remove from clients
-            del self.clients[client_socket]
-            
-            self.log(f"Client {client_info.nickname or 'unknown'} disconnected", "debug")
+            channels = tuple(client_info.channels)
+            for channel in channels:
+                self._detach_from_channel(client_info, channel)
+        
+        nickname = client_info.nickname or "Unknown"
+        for channel in channels:
+            self.broadcast_to_channel(
+                {
+                    "type": "event",
+                    "event": "user_left",
+                    "nickname": nickname,
+                    "channel": channel
+                },
+                channel
+            )
+            self.log(f"{nickname} left {channel}", "debug")
+        
+        # Only the owning reactor's thread may unregister the socket
+        reactor = client_info.reactor
+        if threading.get_ident() == reactor.thread_ident:
+            self._release_socket(client_info)
+        else:
+            reactor.pending.append(client_info)
+            self._wake(reactor)
+        
+        self.log(f"Client {client_info.nickname or 'unknown'} disconnected", "debug")
     
-    def send_response(self, client_socket: socket.socket, response: dict) -> None:
+    def _release_socket(self, client_info: ClientInfo) -> None:
+        """
+        Flush, unregister and close a disconnected client's socket; runs on
+        the thread that owns the client's reactor
+        
+        Args:
+            client_info: Client already removed from self.clients
+        """
+        client_socket = client_info.socket
+        
+        # Best-effort flush of queued output (e.g. a final "Goodbye!")
+        with client_info.out_lock:
+            if client_info.out_buf:
+                try:
+                    with memoryview(client_info.out_buf)[client_info.out_head:] as view:
+                        client_socket.send(view)
+                except OSError:
+                    pass
+                client_info.out_buf.clear()
+                client_info.out_head = 0
+        
+        # Stop watching the socket
+        try:
+            client_info.reactor.sel.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
+        
+        # Close socket
+        try:
+            client_socket.close()
+        except:
+            pass
+    
+    def send_response(self, client_socket: socket.socket, response: Dict[str, Any]) -> None:
         """Send response to client"""
         try:
-            response_json = json.dumps(response) + "\n"
-            client_socket.send(response_json.encode('utf-8'))
+            body = json_dumps(response)
+            self._send_frame(client_socket, body)
         except:
             self.disconnect_client(client_socket)
     
+    def _send_frame(self, client_socket: socket.socket, body: bytes) -> None:
+        """
+        Queue one newline-terminated message on the client's output buffer.
+        The event loop sends everything queued for a client at the end of
+        its current iteration, and waits for writability only if the socket
+        is full, so slow readers never block the server and short writes
+        never drop bytes.
+        
+        Args:
+            client_socket: Destination socket
+            body: Encoded JSON message without the newline
+        """
+        client_info = self.clients.get(client_socket)
+        if client_info is None:
+            return
+        
+        with client_info.out_lock:
+            was_empty = not client_info.out_buf
+            client_info.out_buf += body
+            client_info.out_buf += NL
+        
+        if was_empty:
+            # Schedule a flush; the socket belongs to the client's reactor,
+            # so other workers hand the request over
+            reactor = client_info.reactor
+            if threading.get_ident() == reactor.thread_ident:
+                reactor.dirty.append(client_info)
+            else:
+                reactor.pending.append(client_info)
+                self._wake(reactor)
+    
     def send_success(self, client_socket: socket.socket, message: str) -> None:
         """Send success response to client"""
         self.send_response(client_socket, {
@@ -630,28 +1059,28 @@ Tips:
             "message": message
         })
     
-    def reset_inactivity_timer(self) -> None:
-        """Reset the 3-minute inactivity timer"""
-        if self.inactivity_timer:
-            self.inactivity_timer.cancel()
-        
-        self.inactivity_timer = threading.Timer(180.0, self.check_inactivity)  # 3 minutes
-        self.inactivity_timer.start()
-    
     def check_inactivity(self) -> None:
         """Check for server inactivity and shutdown if needed"""
-        with self.lock:
-            if len(self.clients) == 0:
-                self.log("No clients connected for 3 minutes. Shutting down server.", "info")
-                self.graceful_shutdown()
-            else:
-                # Reset timer if there are still clients
-                self.reset_inactivity_timer()
+        with self._clients_lock:
+            idle = len(self.clients) == 0
+        
+        if idle and time.monotonic() - self.last_activity >= INACTIVITY_TIMEOUT:
+            self.log("No clients connected for 3 minutes. Shutting down server.", "info")
+            self.request_shutdown()
     
-    def signal_handler(self, signum, frame) -> None:
+    def signal_handler(self, signum: int, frame: Optional[FrameType]) -> None:
         """Handle Ctrl-C for graceful shutdown (extra credit)"""
         self.log("\nReceived shutdown signal. Shutting down gracefully...", "info")
-        self.graceful_shutdown()
+        self.request_shutdown()
+    
+    def request_shutdown(self) -> None:
+        """
+        Ask the event loops to stop; safe to call from any thread or from a
+        signal handler. The main loop runs graceful_shutdown() once it wakes.
+        """
+        self.running = False
+        for reactor in self.reactors:
+            self._wake(reactor)
     
     def graceful_shutdown(self) -> None:
         """
@@ -659,29 +1088,39 @@ Tips:
         """
         self.running = False
         
-        # Cancel inactivity timer
-        if self.inactivity_timer:
-            self.inactivity_timer.cancel()
+        # Wait for the other workers to stop, then adopt their reactors so
+        # the cleanup below can unregister and close sockets directly
+        current = threading.current_thread()
+        for reactor in self.reactors:
+            if reactor.thread is not None and reactor.thread is not current:
+                reactor.thread.join(1.0)
+            reactor.thread_ident = current.ident
         
         # Notify all connected clients
-        with self.lock:
-            for client_socket in list(self.clients.keys()):
-                try:
-                    self.send_response(client_socket, {
-                        "type": "response",
-                        "success": True,
-                        "message": "Server is shutting down. Goodbye!"
-                    })
-                except:
-                    pass
-                self.disconnect_client(client_socket)
+        with self._clients_lock:
+            client_sockets = list(self.clients.keys())
         
-        # Close server socket
-        if self.server_socket:
+        for client_socket in client_sockets:
             try:
-                self.server_socket.close()
+                self._send_frame(client_socket, _SHUTDOWN_FRAME)
             except:
                 pass
+            self.disconnect_client(client_socket)
+        
+        # Close the listening sockets, selectors and wakeup sockets
+        for reactor in self.reactors:
+            try:
+                reactor.sel.unregister(reactor.listener)
+            except (KeyError, ValueError):
+                pass
+            try:
+                reactor.listener.close()
+            except:
+                pass
+            
+            reactor.sel.close()
+            for sock in reactor.wake:
+                sock.close()
         
         self.log("Server shutdown complete.", "success")
         sys.exit(0)
@@ -6,82 +6,87 @@ Team: Danny Nguyen, David Salas, Romeo Henderson
 File Created by Danny Nguyen
 """
 
+import os
 import sys
 import signal
 from chat_client import ChatClient
+from utils import Colors
 
-# Simple color codes (since utils.py might not be ready yet)
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[31m'
-    GREEN = '\033[32m'
-    YELLOW = '\033[33m'
-    BLUE = '\033[34m'
-    MAGENTA = '\033[35m'
-    CYAN = '\033[36m'
-    BOLD_RED = '\033[1;31m'
-    BOLD_GREEN = '\033[1;32m'
-    BOLD_YELLOW = '\033[1;33m'
-    BOLD_BLUE = '\033[1;34m'
-    BOLD_CYAN = '\033[1;36m'
-    
-    @staticmethod
-    def colorize(text: str, color: str) -> str:
-        return f"{color}{text}{Colors.RESET}"
+# Messages printed while shutting down or on errors
+# (pre-encoded where the signal handler writes them straight to fd 1)
+_SHUTDOWN_MSG_BYTES = (Colors.YELLOW + "\n\nGracefully shutting down client..." + Colors.RESET + "\n").encode()
+_GOODBYE_BYTES = (Colors.GREEN + "Client shutdown complete. Goodbye!" + Colors.RESET + "\n").encode()
+_INTERRUPT_MSG = Colors.YELLOW + "\nClient shutting down..." + Colors.RESET
+_TROUBLESHOOTING_BLOB = "\n".join([
+    Colors.BOLD_YELLOW + "\nTroubleshooting:" + Colors.RESET,
+    "1. Make sure the server is running first",
+    "2. Check if the server port is correct",
+    "3. Verify network connectivity",
+    "4. Try running: python src/server_main.py -p 8080 -d 1",
+]) + "\n"
+
+# Static banners, colorized and joined once at import
+_WELCOME_BLOB = "\n".join([
+    Colors.BOLD_CYAN + "=" * 60 + Colors.RESET,
+    Colors.BOLD_CYAN + "CSC4220 Chat Client" + Colors.RESET,
+    Colors.CYAN + "Team: Danny Nguyen, David Salas, Romeo Henderson" + Colors.RESET,
+    Colors.BOLD_CYAN + "=" * 60 + Colors.RESET,
+    "",
+    Colors.BOLD_YELLOW + "Available Commands:" + Colors.RESET,
+    "  /connect <server> [port]  - Connect to chat server",
+    "  /nick <nickname>          - Set your nickname",
+    "  /list                     - List available channels",
+    "  /join <channel>           - Join a channel",
+    "  /leave [channel]          - Leave current or specified channel",
+    "  /quit                     - Quit the chat client",
+    "  /help                     - Show this help message",
+    "",
+    Colors.BOLD_GREEN + "To get started, use: /connect localhost 8080" + Colors.RESET,
+    Colors.BOLD_CYAN + "=" * 60 + Colors.RESET,
+    "",
+]) + "\n"
+
+_HELP_BLOB = "\n".join([
+    Colors.BOLD_YELLOW + "\n=== DETAILED HELP ===" + Colors.RESET,
+    "",
+    Colors.BOLD_GREEN + "Connection Process:" + Colors.RESET,
+    "1. Start the client: python src/client_main.py",
+    "2. Connect to server: /connect <server> [port]",
+    "3. Set your nickname: /nick <your_nickname>",
+    "4. Join a channel: /join #general",
+    "5. Start chatting!",
+    "",
+    Colors.BOLD_GREEN + "Command Examples:" + Colors.RESET,
+    "  /connect localhost 8080   - Connect to local server",
+    "  /connect 192.168.1.100    - Connect to remote server (default port 8080)",
+    "  /nick danny123            - Set nickname to 'danny123'",
+    "  /join #general            - Join the #general channel",
+    "  /join programming         - Join #programming (# added automatically)",
+    "  /leave                    - Leave current channel",
+    "  /leave #general           - Leave specific channel",
+    "  /list                     - Show all channels and user counts",
+    "",
+    Colors.BOLD_GREEN + "Tips:" + Colors.RESET,
+    "  - Channel names starting with # are recommended",
+    "  - Nicknames must be unique on the server",
+    "  - Use Ctrl+C to quit gracefully",
+    "  - Type regular messages (no /) to chat in current channel",
+    "",
+]) + "\n"
 
 
 def display_welcome():
     """
     Display welcome message and instructions
     """
-    print(Colors.colorize("=" * 60, Colors.BOLD_CYAN))
-    print(Colors.colorize("CSC4220 Chat Client", Colors.BOLD_CYAN))
-    print(Colors.colorize("Team: Danny Nguyen, David Salas, Romeo Henderson", Colors.CYAN))
-    print(Colors.colorize("=" * 60, Colors.BOLD_CYAN))
-    print()
-    print(Colors.colorize("Available Commands:", Colors.BOLD_YELLOW))
-    print("  /connect <server> [port]  - Connect to chat server")
-    print("  /nick <nickname>          - Set your nickname")
-    print("  /list                     - List available channels")
-    print("  /join <channel>           - Join a channel")
-    print("  /leave [channel]          - Leave current or specified channel")
-    print("  /quit                     - Quit the chat client")
-    print("  /help                     - Show this help message")
-    print()
-    print(Colors.colorize("To get started, use: /connect localhost 8080", Colors.BOLD_GREEN))
-    print(Colors.colorize("=" * 60, Colors.BOLD_CYAN))
-    print()
+    sys.stdout.write(_WELCOME_BLOB)
 
 
 def display_help():
     """
     Display detailed help information
     """
-    print(Colors.colorize("\n=== DETAILED HELP ===", Colors.BOLD_YELLOW))
-    print()
-    print(Colors.colorize("Connection Process:", Colors.BOLD_GREEN))
-    print("1. Start the client: python src/client_main.py")
-    print("2. Connect to server: /connect <server> [port]")
-    print("3. Set your nickname: /nick <your_nickname>")
-    print("4. Join a channel: /join #general")
-    print("5. Start chatting!")
-    print()
-    print(Colors.colorize("Command Examples:", Colors.BOLD_GREEN))
-    print("  /connect localhost 8080   - Connect to local server")
-    print("  /connect 192.168.1.100    - Connect to remote server (default port 8080)")
-    print("  /nick danny123            - Set nickname to 'danny123'")
-    print("  /join #general            - Join the #general channel")
-    print("  /join programming         - Join #programming (# added automatically)")
-    print("  /leave                    - Leave current channel")
-    print("  /leave #general           - Leave specific channel")
-    print("  /list                     - Show all channels and user counts")
-    print()
-    print(Colors.colorize("Tips:", Colors.BOLD_GREEN))
-    print("  - Channel names starting with # are recommended")
-    print("  - Nicknames must be unique on the server")
-    print("  - Use Ctrl+C to quit gracefully")
-    print("  - Type regular messages (no /) to chat in current channel")
-    print()
+    sys.stdout.write(_HELP_BLOB)
 
 
 def setup_signal_handlers(client_instance):
@@ -89,16 +94,21 @@ def setup_signal_handlers(client_instance):
     Set up signal handlers for graceful shutdown
     
     Args:
-        client_instance: Client instance to shutdown
+        client_instance: ChatClient instance to shutdown
     """
-    def signal_handler(signum, frame):
-        print(Colors.colorize("\n\nGracefully shutting down client...", Colors.YELLOW))
-        if client_instance and hasattr(client_instance, 'disconnect'):
-            try:
-                client_instance.disconnect()
-            except:
-                pass  # Ignore errors during shutdown
-        print(Colors.colorize("Client shutdown complete. Goodbye!", Colors.GREEN))
+    # Resolve the disconnect callable now, and bind it as a default argument
+    # so the handler itself does no attribute or closure-cell lookups
+    disconnect = client_instance.disconnect
+    
+    def signal_handler(signum, frame, _disconnect=disconnect):
+        # os.write: one syscall, no print() machinery or stdout lock to
+        # re-enter from signal context
+        os.write(1, _SHUTDOWN_MSG_BYTES)
+        try:
+            _disconnect()
+        except:
+            pass  # Ignore errors during shutdown
+        os.write(1, _GOODBYE_BYTES)
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -124,20 +134,16 @@ def main():
         client.run()
         
     except KeyboardInterrupt:
-        print(Colors.colorize("\nClient shutting down...", Colors.YELLOW))
-        if client and hasattr(client, 'disconnect'):
+        print(_INTERRUPT_MSG)
+        if client is not None:
             try:
                 client.disconnect()
             except:
                 pass
         sys.exit(0)
     except Exception as e:
-        print(Colors.colorize(f"Error running client: {e}", Colors.RED))
-        print(Colors.colorize("\nTroubleshooting:", Colors.BOLD_YELLOW))
-        print("1. Make sure the server is running first")
-        print("2. Check if the server port is correct")
-        print("3. Verify network connectivity")
-        print("4. Try running: python src/server_main.py -p 8080 -d 1")
+        print(Colors.RED + f"Error running client: {e}" + Colors.RESET)
+        sys.stdout.write(_TROUBLESHOOTING_BLOB)
         sys.exit(1)
 
 
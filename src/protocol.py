@@ -1,38 +1,62 @@
 """protocol.py - Object-based protocol definitions
 
-TODO: Define the following:
-
-MESSAGE TYPES:
-- Command messages (CONNECT, NICK, LIST, JOIN, LEAVE, QUIT, HELP)
-- Event messages (USER_JOINED, USER_LEFT, MESSAGE_BROADCAST)
-- Response messages (SUCCESS, ERROR, CHANNEL_LIST, USER_LIST)
-
-PROTOCOL STRUCTURES:
-- Base Message class with serialization methods
-- Command classes inheriting from Message
-- Event classes for server notifications
-- Response classes for server replies
-- JSON serialization/deserialization methods
-
-CONSTANTS:
-- Command type enums
-- Error codes
-- Maximum message lengths
-- Protocol version information
-
-TASKS TO IMPLEMENT:
-1. Create MessageType enum (COMMAND, EVENT, RESPONSE)
-2. Create CommandType enum (CONNECT, NICK, LIST, JOIN, LEAVE, QUIT, HELP, MESSAGE)
-3. Create EventType enum (USER_JOINED, USER_LEFT, MESSAGE_BROADCAST, etc.)
-4. Create ResponseType enum (SUCCESS, ERROR, CHANNEL_LIST, USER_LIST, HELP_TEXT)
-5. Create ErrorCode enum (INVALID_COMMAND, NICKNAME_IN_USE, etc.)
-6. Define protocol constants (MAX_MESSAGE_LENGTH, MAX_NICKNAME_LENGTH, etc.)
-7. Create base Message dataclass with to_json(), from_json(), validate() methods
-8. Create Command dataclass inheriting from Message
-9. Create Event dataclass inheriting from Message
-10. Create Response dataclass inheriting from Message
-11. Implement parse_irc_command() utility function
-12. Implement create_error_response() utility function
-13. Implement create_success_response() utility function
-14. Add command-specific validation methods (validate_connect, validate_nick, etc.)
+- CommandType - IRC-style commands (CONNECT, NICK, LIST, JOIN, LEAVE, QUIT,
+  HELP) plus MESSAGE for regular chat text
+- parse_irc_command() - split a raw input line into command type and argument
+
+Wire message formats (command, event and response objects) are described
+in docs/API.md.
 """
+
+import enum
+from typing import Optional, Tuple, Union
+
+
+class CommandType(enum.IntEnum):
+    """IRC-style commands; integer-valued so a parsed command is a plain int"""
+    CONNECT = 1
+    NICK = 2
+    LIST = 3
+    JOIN = 4
+    LEAVE = 5
+    QUIT = 6
+    HELP = 7
+    MESSAGE = 8  # Regular chat text (no leading /)
+
+
+# Lowercase command names (without the slash) -> command type
+_COMMAND_TYPES = {
+    b"connect": CommandType.CONNECT,
+    b"nick": CommandType.NICK,
+    b"list": CommandType.LIST,
+    b"join": CommandType.JOIN,
+    b"leave": CommandType.LEAVE,
+    b"quit": CommandType.QUIT,
+    b"help": CommandType.HELP,
+}
+
+
+def parse_irc_command(buf: Union[bytes, bytearray]) -> Tuple[Optional[CommandType], str]:
+    """
+    Parse one raw input line into a command type and its argument text
+    
+    The scan stays on bytes (C-level split and dict lookup); only the
+    argument is decoded. The name ends at any whitespace, as in the
+    server's process_command.
+    
+    Args:
+        buf: Raw line, with or without the trailing newline
+    
+    Returns:
+        (command_type, argument) - command_type is None for an unknown
+        /command, and MESSAGE with the whole line for regular chat text
+    """
+    line = bytes(buf).rstrip(b"\r\n")
+    if not line.startswith(b"/"):
+        return CommandType.MESSAGE, line.decode("utf-8", "replace")
+    
+    parts = line[1:].split(None, 1)
+    if not parts:
+        return None, ""
+    arg = parts[1].strip() if len(parts) > 1 else b""
+    return _COMMAND_TYPES.get(parts[0].lower()), arg.decode("utf-8", "replace")
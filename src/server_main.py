@@ -1,43 +1,83 @@
 #!/usr/bin/env python3
 """server_main.py - Entry point for ChatServer application
 
-TODO: Implement the following functionality:
-
-COMMAND LINE PROCESSING:
-- Parse arguments: -p <port#> -d <debug-level>
-- Validate port number (1024-65535)
-- Validate debug level (0 or 1)
-- Display usage information for invalid arguments
-
-SERVER INITIALIZATION:
-- Create ChatServer instance
-- Configure logging based on debug level
-- Set up signal handlers for graceful shutdown
-- Start server on specified port
-
-ERROR HANDLING:
-- Handle port binding failures
-- Manage server startup errors
-- Provide meaningful error messages
-
-TASKS TO IMPLEMENT:
-1. Import required modules (sys, argparse, signal, chat_server, utils)
-2. Implement parse_arguments() function:
-   - Create ArgumentParser with description and help text
-   - Add -p/--port argument (required, type=int)
-   - Add -d/--debug argument (optional, default=0, choices=[0,1])
-   - Add usage examples in epilog
-3. Implement validate_arguments() function:
-   - Check port range (1024-65535)
-   - Check debug level (0 or 1)
-   - Display specific error messages for invalid values
-4. Implement main() function:
-   - Parse and validate command line arguments
-   - Create Logger instance with specified debug level
-   - Display colored startup banner with server info
-   - Create ChatServer instance with port and debug level
-   - Set up signal handlers for graceful shutdown
-   - Start the server and handle exceptions
-   - Handle KeyboardInterrupt for clean shutdown
-5. Add if __name__ == "__main__": guard and call main()
+CSC4220: Computer Networks - Chat Server Project
+Team: Danny Nguyen, David Salas, Romeo Henderson
+
+Usage: python src/server_main.py -p <port#> [-d <debug-level>] [-w <workers>]
 """
+
+import argparse
+import sys
+from typing import List, Optional
+
+from chat_server import ChatServer
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser
+    """
+    parser = argparse.ArgumentParser(
+        description="CSC4220 Chat Server",
+        epilog=(
+            "Examples:\n"
+            "  python src/server_main.py -p 8080\n"
+            "  python src/server_main.py -p 8080 -d 1\n"
+            "  python src/server_main.py -p 8080 -w 4"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("-p", "--port", type=int, required=True,
+                        help="Port number to listen on (1024-65535)")
+    parser.add_argument("-d", "--debug", type=int, default=0, choices=[0, 1],
+                        help="Debug level: 0 = errors only, 1 = all events (default: 0)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Event loop threads sharing the port via SO_REUSEPORT (default: 1)")
+    return parser
+
+
+# Built once at import; parse_arguments() only parses
+_PARSER = _build_parser()
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments
+
+    Args:
+        argv: Arguments to parse (default: sys.argv[1:])
+    """
+    return _PARSER.parse_args(argv)
+
+
+def validate_arguments(args: argparse.Namespace) -> None:
+    """
+    Check argument ranges; prints usage and exits on invalid values
+
+    Args:
+        args: Parsed arguments
+    """
+    if not 1024 <= args.port <= 65535:
+        _PARSER.error(f"port must be between 1024 and 65535 (got {args.port})")
+    if args.workers < 1:
+        _PARSER.error(f"workers must be at least 1 (got {args.workers})")
+
+
+def main() -> None:
+    """
+    Main entry point for chat server
+    """
+    args = parse_arguments()
+    validate_arguments(args)
+
+    # ChatServer installs its own SIGINT/SIGTERM handlers for graceful shutdown
+    server = ChatServer(port=args.port, debug_level=args.debug, worker_count=args.workers)
+    try:
+        server.start_server()
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
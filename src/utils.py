@@ -1,50 +1,346 @@
 """utils.py - Utility functions and helper classes
 
-TODO: Define the following utility functions:
-
-LOGGING UTILITIES:
-- Logger class for debug output (levels 0=errors, 1=all events)
-- Timestamp formatting functions
-- Color output functions (for extra credit)
-
-STRING UTILITIES:
-- Command parsing functions
-- Message formatting functions
-- Input validation functions
-
-NETWORK UTILITIES:
-- Socket helper functions
-- Error handling functions
-- Connection validation functions
-
-THREADING UTILITIES:
-- Thread pool management (for Stage 3)
-- Synchronization helpers
-- Safe shutdown mechanisms
-
-TASKS TO IMPLEMENT:
-1. Create Colors class with ANSI color codes and colorize() method
-2. Create Logger class with debug levels and color support
-   - Implement _format_timestamp() method
-   - Implement error() method (always shown)
-   - Implement info() method (debug level 1 only)
-   - Implement debug() method
-   - Implement success() method
-3. Create ThreadPool class for Stage 3 multi-threading
-   - Implement submit_task() method
-   - Implement _worker_thread() method
-   - Implement shutdown() method
-4. Create NetworkUtils class with static methods
-   - Implement create_server_socket() method
-   - Implement create_client_socket() method
-   - Implement send_message() method
-   - Implement receive_message() method
-5. Create InputValidator class with static validation methods
-   - Implement validate_nickname() method
-   - Implement validate_channel_name() method
-   - Implement validate_port() method
-6. Implement utility functions:
-   - setup_signal_handlers() for graceful shutdown (extra credit)
-   - format_timestamp() for consistent time formatting
-   - parse_command_line_args() for argument processing
+Shared by the server and the client.
+
+JSON:
+- json_dumps() / json_loads() on orjson when installed, else the standard library
+- JSON_DECODE_ERRORS to catch from either decoder
+
+LOGGING:
+- Colors - ANSI color codes, empty when stdout is not a TTY
+- Logger - timestamped lines (debug level 0 = errors only, 1 = all events)
+- format_timestamp() - local time, formatted at most once per second
+
+NETWORK:
+- FramedReader - newline-delimited frames from a socket
+- NetworkUtils - server socket creation, framed send and receive
+
+VALIDATION:
+- InputValidator - nickname and channel name rules
 """
+
+import json
+import re
+import socket
+import sys
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type
+
+# orjson is optional: it is much faster on the per-message encode/decode
+# path, but client and server still run on the standard library alone.
+json_loads: Callable[[Any], Any]
+JSON_DECODE_ERRORS: Tuple[Type[Exception], ...]
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+    json_loads = json.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+# Message terminator for the newline-delimited JSON protocol
+NL = b"\n"
+# Scatter-gather send is unavailable on some platforms (e.g. Windows)
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+# SO_REUSEPORT is Linux/BSD/macOS only; Windows cannot share a listening port
+HAS_REUSEPORT = hasattr(socket, "SO_REUSEPORT")
+
+# One recv() pulls up to 64 KiB, so a burst of frames costs a single syscall
+# (also the server's per-call recv_into() size)
+RECV_CHUNK_SIZE = 65536
+
+
+# Name rules, compiled once; the bound fullmatch methods skip an attribute
+# lookup per call. The client and the server both validate through
+# InputValidator; channel names may carry the leading # (32 characters in
+# total).
+_NICK_MATCH = re.compile(r"[A-Za-z0-9_\-]{1,32}", re.ASCII).fullmatch
+_CHANNEL_MATCH = re.compile(r"#?[A-Za-z0-9_\-]{1,31}", re.ASCII).fullmatch
+
+# Colors only when writing to a terminal; piped or redirected output
+# (log files, CI) gets plain text without escape bytes
+COLOR_OUTPUT = sys.stdout.isatty()
+
+# Last formatted second and its "YYYY-MM-DD HH:MM:SS" string
+_ts_second = -1
+_ts_text = ""
+
+
+def format_timestamp() -> str:
+    """
+    Current local time as YYYY-MM-DD HH:MM:SS; strftime runs at most once
+    per second, every other call returns the cached string
+    """
+    global _ts_second, _ts_text
+    now = int(time.time())
+    if now != _ts_second:
+        _ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _ts_second = now
+    return _ts_text
+
+
+def _noop(message: str) -> None:
+    """Stand-in for log methods whose level is disabled"""
+
+
+class Colors:
+    """ANSI color codes for terminal output (empty when stdout is not a TTY)"""
+    RESET = '\033[0m'
+    RED = '\033[31m'
+    GREEN = '\033[32m'
+    YELLOW = '\033[33m'
+    BLUE = '\033[34m'
+    MAGENTA = '\033[35m'
+    CYAN = '\033[36m'
+    BOLD_RED = '\033[1;31m'
+    BOLD_GREEN = '\033[1;32m'
+    BOLD_YELLOW = '\033[1;33m'
+    BOLD_BLUE = '\033[1;34m'
+    BOLD_CYAN = '\033[1;36m'
+    
+    if not COLOR_OUTPUT:
+        # Empty codes keep concatenation working but emit no escape bytes
+        RESET = RED = GREEN = YELLOW = BLUE = MAGENTA = CYAN = ''
+        BOLD_RED = BOLD_GREEN = BOLD_YELLOW = BOLD_BLUE = BOLD_CYAN = ''
+
+
+class Logger:
+    """
+    Timestamped, colored log lines
+    Debug level 0 shows errors only; level 1 shows all events
+    """
+    
+    # Bound per instance by the debug_level setter
+    info: Callable[[str], None]
+    debug: Callable[[str], None]
+    success: Callable[[str], None]
+    
+    def __init__(self, debug_level: int = 0):
+        """
+        Args:
+            debug_level: 0 for errors only, 1 for all events
+        """
+        self.debug_level = debug_level
+    
+    @property
+    def debug_level(self) -> int:
+        return self._level
+    
+    @debug_level.setter
+    def debug_level(self, level: int) -> None:
+        self._level = level
+        if level >= 1:
+            self.info = self._info
+            self.debug = self._debug
+            self.success = self._success
+        else:
+            # Disabled levels become a bare no-op call: no level check,
+            # timestamp or formatting at all
+            self.info = self.debug = self.success = _noop
+    
+    def _format_timestamp(self) -> str:
+        """Current local time as YYYY-MM-DD HH:MM:SS (cached per second)"""
+        return format_timestamp()
+    
+    def _write(self, color: str, label: str, message: str) -> None:
+        """
+        Write one "[timestamp] LABEL: message" line
+        
+        Args:
+            color: ANSI color for the label and message
+            label: Level prefix such as "ERROR: " (may be empty)
+            message: Text to log
+        """
+        # Every line is built with a single "".join over its parts: repeated
+        # str += can go quadratic, and nested f-strings build intermediates.
+        # Keep it this way in any builder on the logging path.
+        sys.stdout.write("".join((
+            "[", self._format_timestamp(), "] ", color, label, message, Colors.RESET, "\n"
+        )))
+    
+    def error(self, message: str) -> None:
+        """Log an error (always shown)"""
+        self._write(Colors.BOLD_RED, "ERROR: ", message)
+    
+    def _info(self, message: str) -> None:
+        """Log an informational event (bound as info at debug level 1)"""
+        self._write(Colors.YELLOW, "", message)
+    
+    def _debug(self, message: str) -> None:
+        """Log a debug event (bound as debug at debug level 1)"""
+        self._write(Colors.CYAN, "DEBUG: ", message)
+    
+    def _success(self, message: str) -> None:
+        """Log a successful operation (bound as success at debug level 1)"""
+        self._write(Colors.BOLD_GREEN, "", message)
+
+
+class FramedReader:
+    """
+    Splits a socket's byte stream into delimiter-terminated frames, reading
+    in large chunks and locating delimiters with bytearray.find (memchr)
+    instead of a per-byte readline()
+    """
+    
+    def __init__(self, sock: socket.socket, delimiter: bytes = NL):
+        """
+        Args:
+            sock: Connected socket to read from
+            delimiter: Frame terminator
+        """
+        self._sock = sock
+        self._delimiter = delimiter
+        self._pending = bytearray()
+        self._scanned = 0  # Bytes of _pending already known to hold no delimiter
+    
+    def next_frame(self) -> Optional[bytes]:
+        """
+        Return the next frame without its delimiter, reading as needed
+        
+        Returns:
+            Frame bytes, or None once the peer has closed the connection
+        """
+        delimiter = self._delimiter
+        pending = self._pending
+        while True:
+            idx = pending.find(delimiter, self._scanned)
+            if idx >= 0:
+                frame = bytes(pending[:idx])
+                del pending[:idx + len(delimiter)]
+                self._scanned = 0
+                return frame
+            
+            # A delimiter may straddle the next chunk boundary
+            self._scanned = max(0, len(pending) - len(delimiter) + 1)
+            data = self._sock.recv(RECV_CHUNK_SIZE)
+            if not data:
+                return None
+            pending += data
+
+
+class NetworkUtils:
+    """Socket helper functions"""
+    
+    @staticmethod
+    def create_server_socket(port: int, reuse_port: bool = False, backlog: int = 5) -> socket.socket:
+        """
+        Create a TCP socket bound to port on all interfaces and listening
+        
+        With reuse_port, several sockets (one per accept thread) can bind
+        the same port and the kernel spreads new connections across them,
+        so accept() is no longer a single contention point. Where
+        SO_REUSEPORT is missing (Windows, see HAS_REUSEPORT) a second bind
+        would fail, so callers should fall back to one listener.
+        
+        Args:
+            port: Port number to bind
+            reuse_port: Set SO_REUSEPORT so other sockets can share the port
+            backlog: Pending connection queue length for listen()
+        
+        Returns:
+            Listening (blocking) socket
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(('', port))
+            sock.listen(backlog)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    
+    @staticmethod
+    def send_message(sock: socket.socket, payload: bytes) -> None:
+        """
+        Send one message followed by the newline terminator. The kernel
+        gathers payload and terminator itself, so no concatenated copy is
+        built.
+        
+        Args:
+            sock: Connected blocking socket
+            payload: Encoded message without the newline
+        """
+        if not _HAS_SENDMSG:
+            sock.sendall(payload + NL)
+            return
+        
+        sent = sock.sendmsg((payload, NL))
+        if sent < len(payload):
+            # Short write: finish the payload in place, then the terminator
+            sock.sendall(memoryview(payload)[sent:])
+            sent = len(payload)
+        if sent == len(payload):
+            sock.sendall(NL)
+    
+    @staticmethod
+    def receive_message(reader: FramedReader) -> Optional[str]:
+        """
+        Receive one newline-terminated message
+        
+        Args:
+            reader: FramedReader wrapping the connected socket
+        
+        Returns:
+            Decoded message text, or None if the connection closed
+        """
+        frame = reader.next_frame()
+        if frame is None:
+            return None
+        return frame.decode("utf-8", "replace")
+
+
+class InputValidator:
+    """Validation of user-supplied names"""
+    
+    @staticmethod
+    def validate_nickname(nickname: str) -> bool:
+        """
+        Check a nickname: 1-32 ASCII letters, digits, underscores or hyphens
+        
+        Args:
+            nickname: Nickname to check
+        
+        Returns:
+            True if the nickname is valid
+        """
+        return _NICK_MATCH(nickname) is not None
+    
+    @staticmethod
+    def validate_nicknames(nicknames: Iterable[str]) -> List[bool]:
+        """
+        Check many nicknames at once (e.g. during a connection flood)
+        
+        Args:
+            nicknames: Nicknames to check
+        
+        Returns:
+            One validity flag per nickname, in order
+        """
+        match = _NICK_MATCH
+        return [match(nickname) is not None for nickname in nicknames]
+    
+    @staticmethod
+    def validate_channel_name(channel: str) -> bool:
+        """
+        Check a channel name: optional leading #, then 1-31 ASCII letters,
+        digits, underscores or hyphens
+        
+        Args:
+            channel: Channel name to check
+        
+        Returns:
+            True if the channel name is valid
+        """
+        return _CHANNEL_MATCH(channel) is not None
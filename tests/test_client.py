@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""test_client.py - Tests for the chat client
+
+Wire format, line framing and command parsing on a ChatClient instance,
+and client_main.py run as a subprocess against a ChatServer in the test
+process, with standard input redirected from a file or /dev/null.
+"""
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import Any, List
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(TESTS_DIR, "..", "src")
+
+# Add src and tests directories to Python path for imports
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, TESTS_DIR)
+
+import utils
+from chat_client import ChatClient, pop_lines
+from test_server import ServerTestCase, _event
+
+CLIENT_MAIN = os.path.join(SRC_DIR, "client_main.py")
+
+
+def run_client(stdin_path: str) -> subprocess.CompletedProcess:
+    """Run the client to completion with stdin redirected from stdin_path"""
+    with open(stdin_path, "rb") as stdin:
+        return subprocess.run([sys.executable, CLIENT_MAIN], stdin=stdin,
+                              capture_output=True, timeout=30)
+
+
+def quiet_client() -> ChatClient:
+    """ChatClient whose display output goes to a buffer"""
+    client = ChatClient()
+    client._out = io.BytesIO()
+    return client
+
+
+def stdlib_json_dumps(obj: Any) -> bytes:
+    """The standard library fallback used when orjson is missing"""
+    return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+
+class TestPopLines(unittest.TestCase):
+    """pop_lines() framing"""
+
+    def test_keeps_trailing_partial_line(self) -> None:
+        buffer = bytearray(b"one\ntwo\nthr")
+        self.assertEqual(pop_lines(buffer), [b"one", b"two"])
+        self.assertEqual(buffer, b"thr")
+
+        buffer += b"ee\n"
+        self.assertEqual(pop_lines(buffer, 3), [b"three"])
+        self.assertEqual(buffer, b"")
+
+    def test_no_complete_line(self) -> None:
+        buffer = bytearray(b"partial")
+        self.assertEqual(pop_lines(buffer), [])
+        self.assertEqual(buffer, b"partial")
+
+    def test_empty_lines(self) -> None:
+        buffer = bytearray(b"\n\nx\n")
+        self.assertEqual(pop_lines(buffer), [b"", b"", b"x"])
+        self.assertEqual(buffer, b"")
+
+
+class TestWireFormat(unittest.TestCase):
+    """send_command() output and receive_messages() framing over a socketpair"""
+
+    NICKNAMES = ["bob", 'say "hi"', "back\\slash", "émile", "名前", ""]
+    COMMANDS = ["/join #general", 'he said "hello"', "café ☕", "tab\there", "line\nbreak"]
+
+    def setUp(self) -> None:
+        self.client = quiet_client()
+        self.client.client_socket, self.server = socket.socketpair()
+        self.client.connected = True
+        self.server.settimeout(5)
+
+    def tearDown(self) -> None:
+        self.client.client_socket.close()
+        self.server.close()
+        self.client._selector.close()
+
+    def sent_messages(self, count: int) -> List[Any]:
+        """Read count lines from the client and parse each as JSON"""
+        data = b""
+        while data.count(b"\n") < count:
+            data += self.server.recv(65536)
+        lines = data.split(b"\n")
+        self.assertEqual(lines[count:], [b""])
+        return [json.loads(line) for line in lines[:count]]
+
+    def check_send_command(self) -> None:
+        for nickname in self.NICKNAMES:
+            self.client.nickname = nickname
+            for command in self.COMMANDS:
+                self.assertTrue(self.client.send_command(command))
+            for message, command in zip(self.sent_messages(len(self.COMMANDS)), self.COMMANDS):
+                self.assertEqual(message["type"], "command")
+                self.assertEqual(message["nickname"], nickname)
+                self.assertEqual(message["command"], command)
+                self.assertIsInstance(message["timestamp"], int)
+
+    @unittest.skipIf(utils.orjson is None, "orjson not installed")
+    def test_send_command_orjson(self) -> None:
+        self.check_send_command()
+
+    def test_send_command_stdlib(self) -> None:
+        with mock.patch("chat_client.json_dumps", stdlib_json_dumps):
+            self.check_send_command()
+
+    def test_receive_messages_reassembles_split_lines(self) -> None:
+        received: List[str] = []
+        self.client.process_server_message = received.append
+        frame = json.dumps({"type": "response", "message": "café"}).encode() + b"\n"
+        # Second frame split inside the UTF-8 sequence for "é"
+        second = "{\"message\": \"é\"}\n".encode()
+        cut = second.index(b"\xc3") + 1
+
+        self.server.sendall(frame + second[:cut])
+        self.client.receive_messages()
+        self.assertEqual(received, [frame.decode().strip()])
+
+        self.server.sendall(second[cut:])
+        self.client.receive_messages()
+        self.assertEqual(received[1], second.decode().strip())
+        self.assertEqual(self.client._recv_buffer, b"")
+
+
+class TestCommandParsing(unittest.TestCase):
+    """ChatClient.parse_and_handle_command()"""
+
+    def test_any_whitespace_ends_the_name(self) -> None:
+        for command in ("/nick bob", "/nick\tbob", "/NICK   bob  ", "/ nick bob"):
+            client = quiet_client()
+            self.assertTrue(client.parse_and_handle_command(command), command)
+            self.assertEqual(client.nickname, "bob")
+
+    def test_unknown_and_empty_commands(self) -> None:
+        client = quiet_client()
+        self.assertFalse(client.parse_and_handle_command("/bogus x"))
+        self.assertIn(b"Unknown command: /bogus", client._out.getvalue())
+        self.assertFalse(client.parse_and_handle_command("/"))
+
+    def test_missing_argument(self) -> None:
+        client = quiet_client()
+        self.assertFalse(client.parse_and_handle_command("/nick"))
+        self.assertIn(b"Usage: /nick <nickname>", client._out.getvalue())
+
+
+class TestRedirectedInput(ServerTestCase):
+    """stdin from a regular file or /dev/null, which epoll refuses"""
+
+    def test_commands_from_file(self) -> None:
+        listener = self.connect("alice", "#test")
+        commands = "".join(line + "\n" for line in (
+            f"/connect 127.0.0.1 {self.port}",
+            "/nick bob",
+            "/join #test",
+            "hello from a file",
+            "/quit",
+        ))
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(commands)
+        self.addCleanup(os.unlink, f.name)
+
+        result = run_client(f.name)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertNotIn(b"Error running client", result.stdout)
+        message = listener.receive_until(_event("message"))
+        self.assertEqual((message["nickname"], message["message"]), ("bob", "hello from a file"))
+
+    def test_stdin_from_dev_null(self) -> None:
+        result = run_client(os.devnull)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertNotIn(b"Error running client", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
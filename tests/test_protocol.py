@@ -2,20 +2,87 @@
 """
 test_protocol.py - Unit tests for protocol implementation
 
-TODO: Implement test cases for:
-
 COMMAND PARSING TESTS:
-- Test valid IRC command parsing
-- Test invalid command handling
-- Test command parameter validation
-
-MESSAGE SERIALIZATION TESTS:
-- Test object to JSON conversion
-- Test JSON to object parsing
-- Test malformed message handling
+- Valid IRC command parsing
+- Invalid command handling
+- Command parameter handling
 
 PROTOCOL VALIDATION TESTS:
-- Test nickname validation rules
-- Test channel name validation
-- Test message length limits
+- Nickname validation rules
+- Channel name validation
+
+TODO: Message length limits, once the protocol defines them
 """
+
+import os
+import sys
+import unittest
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from protocol import CommandType, parse_irc_command
+from utils import InputValidator
+
+
+class TestCommandParsing(unittest.TestCase):
+    """parse_irc_command()"""
+
+    def test_valid_commands(self) -> None:
+        self.assertEqual(parse_irc_command(b"/nick bob\n"), (CommandType.NICK, "bob"))
+        self.assertEqual(parse_irc_command(b"/join #general\r\n"), (CommandType.JOIN, "#general"))
+        self.assertEqual(parse_irc_command(b"/connect localhost 8080"),
+                         (CommandType.CONNECT, "localhost 8080"))
+        self.assertEqual(parse_irc_command(bytearray(b"/list")), (CommandType.LIST, ""))
+
+    def test_command_name_is_case_insensitive(self) -> None:
+        self.assertEqual(parse_irc_command(b"/QUIT"), (CommandType.QUIT, ""))
+        self.assertEqual(parse_irc_command(b"/Help"), (CommandType.HELP, ""))
+
+    def test_any_whitespace_ends_the_name(self) -> None:
+        # Same split as the server's process_command
+        self.assertEqual(parse_irc_command(b"/nick\tbob"), (CommandType.NICK, "bob"))
+        self.assertEqual(parse_irc_command(b"/leave   #a  "), (CommandType.LEAVE, "#a"))
+
+    def test_unknown_commands(self) -> None:
+        self.assertEqual(parse_irc_command(b"/bogus arg"), (None, "arg"))
+        self.assertEqual(parse_irc_command(b"/"), (None, ""))
+        self.assertEqual(parse_irc_command(b"/ "), (None, ""))
+
+    def test_regular_messages(self) -> None:
+        self.assertEqual(parse_irc_command(b"hello there\n"), (CommandType.MESSAGE, "hello there"))
+        self.assertEqual(parse_irc_command("café".encode()), (CommandType.MESSAGE, "café"))
+
+    def test_argument_is_decoded_leniently(self) -> None:
+        command, arg = parse_irc_command(b"/nick \xff")
+        self.assertEqual(command, CommandType.NICK)
+        self.assertEqual(arg, "�")
+
+
+class TestNameValidation(unittest.TestCase):
+    """InputValidator nickname and channel rules"""
+
+    NICKNAMES = ["a", "alice", "Bob_2", "x-y", "a" * 32, "a" * 33, "", "al ice",
+                 "alice!", "#alice", "émile", "alice\n", "１２３"]
+
+    def test_nickname_rules(self) -> None:
+        for nickname in ("a", "alice", "Bob_2", "x-y", "a" * 32):
+            self.assertTrue(InputValidator.validate_nickname(nickname), nickname)
+        for nickname in ("", "a" * 33, "al ice", "alice!", "#alice", "émile", "alice\n", "１２３"):
+            self.assertFalse(InputValidator.validate_nickname(nickname), repr(nickname))
+
+    def test_validate_nicknames(self) -> None:
+        self.assertEqual(InputValidator.validate_nicknames(self.NICKNAMES),
+                         [InputValidator.validate_nickname(n) for n in self.NICKNAMES])
+        self.assertEqual(InputValidator.validate_nicknames(iter([])), [])
+
+    def test_channel_rules(self) -> None:
+        # 32 characters in total including the optional leading #
+        for channel in ("general", "#general", "#" + "c" * 31, "c" * 31, "#a-b_c"):
+            self.assertTrue(InputValidator.validate_channel_name(channel), channel)
+        for channel in ("", "#", "##general", "#" + "c" * 32, "c" * 32, "#gen eral", "#gén"):
+            self.assertFalse(InputValidator.validate_channel_name(channel), repr(channel))
+
+
+if __name__ == "__main__":
+    unittest.main()
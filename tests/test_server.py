@@ -1,72 +1,299 @@
 #!/usr/bin/env python3
 """test_server.py - Integration tests for server functionality
 
-TODO: Implement test cases for:
-
-SERVER STARTUP TESTS:
-- Test server initialization with valid parameters
-- Test error handling for invalid ports
-- Test debug level configuration
-
-CLIENT CONNECTION TESTS:
-- Test single client connection
-- Test multiple client connections
-- Test connection limits (Stage 3)
-
-CHANNEL MANAGEMENT TESTS:
-- Test channel creation and deletion
-- Test user join/leave operations
-- Test message broadcasting within channels
-
-THREADING TESTS (Stage 3):
-- Test concurrent client handling
-- Test thread safety of shared data
-- Test maximum thread limit enforcement
-
-TASKS TO IMPLEMENT:
-1. Import required modules (unittest, socket, threading, time, json, sys, os)
-2. Add src directory to Python path for imports
-3. Import server and client classes, protocol classes, utils
-4. Create TestServerStartup class with test methods:
-   - setUp() and tearDown() methods
-   - test_server_creation()
-   - test_server_port_binding()
-   - test_server_startup()
-   - test_invalid_port_handling()
-5. Create TestClientConnections class with test methods:
-   - setUp() and tearDown() methods
-   - test_single_client_connection()
-   - test_multiple_client_connections()
-   - test_client_disconnection()
-   - test_connection_limits() (Stage 3)
-6. Create TestChannelManagement class with test methods:
-   - setUp() and tearDown() methods
-   - test_channel_creation()
-   - test_channel_joining()
-   - test_channel_leaving()
-   - test_channel_deletion()
-   - test_message_broadcasting()
-   - test_channel_listing()
-7. Create TestIRCCommands class with test methods:
-   - setUp() and tearDown() methods
-   - test_nick_command()
-   - test_list_command()
-   - test_join_command()
-   - test_leave_command()
-   - test_quit_command()
-   - test_help_command()
-8. Create TestThreading class with test methods (Stage 3):
-   - setUp() and tearDown() methods
-   - test_concurrent_connections()
-   - test_thread_safety()
-   - test_thread_limit_enforcement()
-   - test_thread_cleanup()
-9. Create TestErrorHandling class with test methods:
-   - test_malformed_messages()
-   - test_network_errors()
-   - test_invalid_commands()
-10. Implement utility functions:
-    - create_test_client() - helper for creating test clients
-    - send_command_to_server() - helper for sending commands
-    - run_tests() - main test runner with unittest.main()
+Socket-level tests against a ChatServer running in a background thread:
+channel join/broadcast/leave/quit with one and several event loop workers,
+output to a slow reader that forces partial sends, and malformed lines.
 """
+
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import unittest
+from typing import Any, Callable, Dict, List
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from chat_server import ChatServer
+from utils import FramedReader, NetworkUtils
+
+# Seconds to wait for any single expected message
+TIMEOUT = 5.0
+
+
+def _free_port() -> int:
+    """Ask the kernel for a currently unused TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestClient:
+    """Blocking test connection that reads the server's JSON lines"""
+
+    def __init__(self, port: int, rcvbuf: int = 0):
+        """
+        Args:
+            port: Server port
+            rcvbuf: SO_RCVBUF to set before connecting (0 keeps the default)
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if rcvbuf:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        self.sock.settimeout(TIMEOUT)
+        self.sock.connect(("127.0.0.1", port))
+        self.reader = FramedReader(self.sock)
+
+    def send(self, line: str) -> None:
+        """Send one line (a plain text command or chat message)"""
+        NetworkUtils.send_message(self.sock, line.encode())
+
+    def receive(self) -> Dict[str, Any]:
+        """Return the next message; fails the test on EOF or timeout"""
+        text = NetworkUtils.receive_message(self.reader)
+        if text is None:
+            raise AssertionError("server closed the connection")
+        return json.loads(text)
+
+    def receive_until(self, predicate: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+        """Skip messages until one matches predicate and return it"""
+        while True:
+            message = self.receive()
+            if predicate(message):
+                return message
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def create_test_client(port: int, nickname: str = "", channel: str = "") -> TestClient:
+    """Connect a client, optionally setting its nickname and joining a channel"""
+    client = TestClient(port)
+    if nickname:
+        send_command_to_server(client, f"/nick {nickname}")
+    if channel:
+        send_command_to_server(client, f"/join {channel}")
+    return client
+
+
+def send_command_to_server(client: TestClient, command: str) -> Dict[str, Any]:
+    """Send a command and return the server's response to it"""
+    client.send(command)
+    return client.receive_until(lambda m: m.get("type") == "response")
+
+
+def _event(name: str, **fields: Any) -> Callable[[Dict[str, Any]], bool]:
+    """Predicate matching an event message with the given field values"""
+    def match(message: Dict[str, Any]) -> bool:
+        return (message.get("event") == name
+                and all(message.get(k) == v for k, v in fields.items()))
+    return match
+
+
+class ServerTestCase(unittest.TestCase):
+    """Runs a fresh server on a free port around every test"""
+
+    worker_count = 1
+
+    def setUp(self) -> None:
+        # ChatServer installs its own SIGINT/SIGTERM handlers
+        self._saved_handlers = (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM))
+        self.port = _free_port()
+        self.server = ChatServer(port=self.port, debug_level=0, worker_count=self.worker_count)
+        self.thread = threading.Thread(target=self.server.start_server, daemon=True)
+        self.thread.start()
+
+        deadline = time.monotonic() + TIMEOUT
+        while not self.server.running:
+            if time.monotonic() > deadline:
+                self.fail("server did not start")
+            time.sleep(0.01)
+        self.clients: List[TestClient] = []
+
+    def tearDown(self) -> None:
+        for client in self.clients:
+            client.close()
+        self.server.request_shutdown()
+        self.thread.join(TIMEOUT)
+        signal.signal(signal.SIGINT, self._saved_handlers[0])
+        signal.signal(signal.SIGTERM, self._saved_handlers[1])
+
+    def connect(self, nickname: str = "", channel: str = "") -> TestClient:
+        client = create_test_client(self.port, nickname, channel)
+        self.clients.append(client)
+        return client
+
+
+class TestServerStartup(ServerTestCase):
+    """Port binding"""
+
+    worker_count = 2
+
+    def test_port_in_use(self) -> None:
+        # A second SO_REUSEPORT group on the same port must not come up
+        for worker_count in (1, 2):
+            second = ChatServer(port=self.port, debug_level=0, worker_count=worker_count)
+            with self.assertRaises(SystemExit) as cm:
+                second.start_server()
+            self.assertEqual(cm.exception.code, 1)
+            self.assertFalse(second.running)
+
+
+class TestChannelManagement(ServerTestCase):
+    """Join, broadcast, leave and quit on a single event loop"""
+
+    def test_join_broadcast_leave_quit(self) -> None:
+        alice = self.connect("alice", "#test")
+        bob = self.connect("bob")
+
+        response = send_command_to_server(bob, "/join test")
+        self.assertEqual(response["message"], "Joined channel #test")
+        alice.receive_until(_event("user_joined", nickname="bob", channel="#test"))
+
+        bob.send("hello everyone")
+        message = alice.receive_until(_event("message"))
+        self.assertEqual(message["nickname"], "bob")
+        self.assertEqual(message["channel"], "#test")
+        self.assertEqual(message["message"], "hello everyone")
+
+        response = send_command_to_server(bob, "/leave #test")
+        self.assertEqual(response["message"], "Left channel #test")
+        alice.receive_until(_event("user_left", nickname="bob", channel="#test"))
+
+        response = send_command_to_server(alice, "/quit")
+        self.assertEqual(response["message"], "Goodbye!")
+        self.assertIsNone(alice.reader.next_frame())
+
+    def test_broadcast_reaches_every_member(self) -> None:
+        clients = [self.connect(f"user{i}", "#room") for i in range(8)]
+
+        clients[0].send("ping")
+        for client in clients[1:]:
+            message = client.receive_until(_event("message"))
+            self.assertEqual((message["nickname"], message["message"]), ("user0", "ping"))
+
+    def test_nick_in_use(self) -> None:
+        self.connect("alice")
+        bob = self.connect()
+
+        response = send_command_to_server(bob, "/nick alice")
+        self.assertFalse(response["success"])
+        self.assertEqual(response["message"], "Nickname 'alice' is already in use")
+
+
+class TestMultiWorkerChannels(TestChannelManagement):
+    """The same scenarios with clients spread over several event loops,
+    so broadcasts cross workers through the pending queue and wakeup socket"""
+
+    worker_count = 4
+
+
+class TestPartialSends(ServerTestCase):
+    """Frames larger than the socket buffers reach slow readers intact"""
+
+    def test_large_frame_to_slow_reader(self) -> None:
+        reader = TestClient(self.port, rcvbuf=4096)
+        self.clients.append(reader)
+        send_command_to_server(reader, "/nick reader")
+        send_command_to_server(reader, "/join #bulk")
+        writer = self.connect("writer", "#bulk")
+        reader.receive_until(_event("user_joined", nickname="writer"))
+
+        payload = "".join(chr(ord("a") + i % 26) for i in range(2 * 1024 * 1024))
+        writer.send(payload)
+        writer.send("after")
+
+        # Let the server fill the socket buffers and queue the rest
+        time.sleep(0.5)
+        message = reader.receive_until(_event("message"))
+        self.assertEqual(len(message["message"]), len(payload))
+        self.assertEqual(message["message"], payload)
+        self.assertEqual(reader.receive_until(_event("message"))["message"], "after")
+
+
+class TestMultiWorkerPartialSends(TestPartialSends):
+    worker_count = 4
+
+
+class TestErrorHandling(ServerTestCase):
+    """Malformed and unknown input"""
+
+    def test_malformed_messages(self) -> None:
+        client = self.connect()
+        client.send("/nick alice")
+        # JSON values that are not objects are handled as plain text
+        for line in ("null", "42", "true"):
+            client.send(line)
+        client.send('{"type": "command", "command": 5}')
+        for _ in range(3):
+            client.send("/help")
+
+        nick_replies = help_replies = 0
+        errors = []
+        while help_replies < 3:
+            message = client.receive()
+            if message.get("message") == "Nickname set to 'alice'":
+                nick_replies += 1
+            elif "CHAT SERVER HELP" in message.get("message", ""):
+                help_replies += 1
+            elif message.get("success") is False:
+                errors.append(message["message"])
+        self.assertEqual(nick_replies, 1)
+        # The three plain text lines are chat with no channel joined
+        self.assertEqual(errors, ["Please join a channel first with /join <channel>"] * 3
+                         + ["Malformed command message"])
+
+    def test_non_command_objects_are_ignored(self) -> None:
+        alice = self.connect("alice", "#test")
+        bob = self.connect("bob", "#test")
+        alice.receive_until(_event("user_joined", nickname="bob"))
+
+        bob.send('{"type": "ping", "seq": 1}')
+        bob.send("real message")
+        message = alice.receive_until(_event("message"))
+        self.assertEqual(message["message"], "real message")
+
+    def test_json_nickname_cannot_take_a_used_name(self) -> None:
+        self.connect("alice")
+        bob = self.connect()
+        bob.send(json.dumps({"type": "command", "command": "/list", "nickname": "alice"}))
+        bob.receive_until(_event("channel_list"))
+
+        nicknames = sorted(info.nickname for info in self.server.clients.values())
+        self.assertEqual(nicknames, ["", "alice"])
+
+    def test_invalid_names(self) -> None:
+        client = self.connect()
+        for command, error in (
+            ("/nick " + "a" * 33, "Invalid nickname (1-32 letters, digits, '_' or '-')"),
+            ("/nick bad!name", "Invalid nickname (1-32 letters, digits, '_' or '-')"),
+            ("/join #bad!channel", "Invalid channel name (1-31 letters, digits, '_' or '-' after '#')"),
+            ("/join " + "c" * 32, "Invalid channel name (1-31 letters, digits, '_' or '-' after '#')"),
+        ):
+            response = send_command_to_server(client, command)
+            self.assertFalse(response["success"], command)
+            self.assertEqual(response["message"], error)
+        self.assertNotIn("#bad!channel", self.server.channels)
+        self.assertNotIn("#" + "c" * 32, self.server.channels)
+
+    def test_invalid_commands(self) -> None:
+        client = self.connect()
+        response = send_command_to_server(client, "/bogus")
+        self.assertFalse(response["success"])
+        self.assertEqual(response["message"], "Unknown command: /bogus")
+
+
+def run_tests() -> None:
+    unittest.main()
+
+
+if __name__ == "__main__":
+    run_tests()
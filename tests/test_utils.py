@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""test_utils.py - Unit tests for utility functions
+
+LOGGING TESTS:
+- Logger level methods rebound by the debug_level setter
+- Per-second timestamp cache
+
+NETWORK TESTS:
+- send_message() with short sendmsg() writes
+"""
+
+import io
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import utils
+from utils import Logger, NetworkUtils, format_timestamp
+
+
+class TestLogger(unittest.TestCase):
+    """Logger levels and output"""
+
+    def capture(self, logger: Logger) -> str:
+        """Log one line at every level and return what was written"""
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+            logger.error("e")
+            logger.info("i")
+            logger.debug("d")
+            logger.success("s")
+        return out.getvalue()
+
+    def test_level_zero_binds_no_ops(self) -> None:
+        logger = Logger(0)
+        for name in ("info", "debug", "success"):
+            self.assertIs(getattr(logger, name), utils._noop)
+        lines = self.capture(logger).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn("ERROR: e", lines[0])
+
+    def test_level_one_logs_everything(self) -> None:
+        logger = Logger(1)
+        self.assertEqual(logger.info, logger._info)
+        self.assertEqual(logger.debug, logger._debug)
+        self.assertEqual(logger.success, logger._success)
+        lines = self.capture(logger).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn("DEBUG: d", lines[2])
+
+    def test_setter_rebinds(self) -> None:
+        logger = Logger(0)
+        logger.debug_level = 1
+        self.assertEqual(logger.debug_level, 1)
+        self.assertEqual(len(self.capture(logger).splitlines()), 4)
+        logger.debug_level = 0
+        self.assertIs(logger.info, utils._noop)
+        self.assertEqual(len(self.capture(logger).splitlines()), 1)
+
+    def test_line_format(self) -> None:
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+            Logger(1).info("hello")
+        line = out.getvalue()
+        self.assertRegex(line, r"^\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] ")
+        self.assertIn("hello", line)
+        self.assertTrue(line.endswith("\n"))
+
+
+class TestFormatTimestamp(unittest.TestCase):
+    """format_timestamp() caching"""
+
+    def setUp(self) -> None:
+        utils._ts_second = -1
+
+    def test_strftime_runs_once_per_second(self) -> None:
+        now = 1_700_000_000.25
+        with mock.patch("utils.time.time", side_effect=[now, now + 0.5, now + 1.0]), \
+                mock.patch("utils.time.strftime", wraps=time.strftime) as strftime:
+            first = format_timestamp()
+            second = format_timestamp()
+            self.assertEqual(strftime.call_count, 1)
+            self.assertIs(first, second)
+
+            third = format_timestamp()
+            self.assertEqual(strftime.call_count, 2)
+
+        expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(now)))
+        self.assertEqual(first, expected)
+        self.assertNotEqual(third, first)
+
+
+class RecordingSocket(socket.socket):
+    """Socket that records what each sendmsg() call returned"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.sendmsg_results = []
+
+    def sendmsg(self, buffers, *args):  # type: ignore[override]
+        sent = super().sendmsg(buffers, *args)
+        self.sendmsg_results.append(sent)
+        return sent
+
+
+class TestSendMessage(unittest.TestCase):
+    """NetworkUtils.send_message()"""
+
+    def setUp(self) -> None:
+        left, self.right = socket.socketpair()
+        self.left = RecordingSocket(left.family, left.type, fileno=left.detach())
+        self.left.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        # A timeout makes the socket non-blocking underneath, so sendmsg()
+        # returns after a partial write instead of waiting for the reader
+        self.left.settimeout(5)
+        self.right.settimeout(5)
+
+    def tearDown(self) -> None:
+        self.left.close()
+        self.right.close()
+
+    def receive(self, size: int, into: bytearray) -> None:
+        while len(into) < size:
+            data = self.right.recv(65536)
+            if not data:
+                break
+            into += data
+
+    @unittest.skipUnless(utils._HAS_SENDMSG, "sendmsg() not available")
+    def test_partial_sendmsg(self) -> None:
+        payload = bytes(range(256)) * 4096  # 1 MiB
+        received = bytearray()
+        reader = threading.Thread(target=self.receive, args=(len(payload) + 1, received))
+        reader.start()
+        NetworkUtils.send_message(self.left, payload)
+        reader.join(10)
+
+        self.assertLess(self.left.sendmsg_results[0], len(payload))
+        self.assertEqual(bytes(received), payload + b"\n")
+
+    def test_messages_stay_framed(self) -> None:
+        received = bytearray()
+        reader = threading.Thread(target=self.receive, args=(1 + 4 + 30000 + 1, received))
+        reader.start()
+        for payload in (b"", b"one", b"two" * 10000):
+            NetworkUtils.send_message(self.left, payload)
+        reader.join(10)
+        self.assertEqual(bytes(received), b"\none\n" + b"two" * 10000 + b"\n")
+
+
+if __name__ == "__main__":
+    unittest.main()